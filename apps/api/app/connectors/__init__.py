@@ -1,11 +1,145 @@
 # Connectors module
-from typing import Type
+import asyncio
+import hashlib
+import importlib
+import logging
+import sys
+import time
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Optional, Type
+from app.core.config import settings
 from app.models import DataSourceType, ConnectionConfig
 from app.connectors.base import BaseConnector
 
+logger = logging.getLogger(__name__)
 
-def get_connector(data_source_type: DataSourceType, config: ConnectionConfig) -> BaseConnector:
-    """Factory function to get the appropriate connector for a data source type."""
+
+@dataclass(slots=True)
+class _PoolEntry:
+    """A pooled connector and the queries currently using it."""
+    connector: BaseConnector
+    fingerprint: str
+    active: int = 0
+    retired: bool = False
+    last_used: float = field(default_factory=time.monotonic)
+
+
+# Connectors are reused across requests for the same data source so their pools stay
+# warm. Keyed by data source id, so releasing one source never closes another's connector
+_connector_pool: Dict[str, _PoolEntry] = {}
+_maintenance_task: Optional[asyncio.Task] = None
+
+
+def _fingerprint(data_source_type: DataSourceType, config: ConnectionConfig) -> str:
+    """Identify a data source type and config, to detect a changed config."""
+    return hashlib.sha1(f"{data_source_type.value}:{config.model_dump_json()}".encode()).hexdigest()
+
+
+async def _retire(entry: _PoolEntry) -> None:
+    """Close a connector removed from the pool once no query is using it."""
+    entry.retired = True
+    if entry.active == 0:
+        try:
+            await entry.connector.disconnect()
+        except Exception as e:
+            logger.warning("Failed to close connector: %s", e)
+
+
+async def _checkout(
+    source_id: str, data_source_type: DataSourceType, config: ConnectionConfig
+) -> _PoolEntry:
+    """Get the pool entry for a data source, replacing it if its config changed."""
+    fingerprint = _fingerprint(data_source_type, config)
+    entry = _connector_pool.get(source_id)
+    if entry is not None and entry.fingerprint == fingerprint:
+        return entry
+    
+    new_entry = _PoolEntry(_create_connector(data_source_type, config), fingerprint)
+    _connector_pool[source_id] = new_entry
+    if entry is not None:
+        await _retire(entry)
+    await _evict_over_capacity()
+    return new_entry
+
+
+@asynccontextmanager
+async def use_connector(
+    source_id: str, data_source_type: DataSourceType, config: ConnectionConfig
+) -> AsyncIterator[BaseConnector]:
+    """Use the pooled connector for a data source, creating it if needed.
+    
+    A connector released while in use is closed when its last user exits.
+    """
+    entry = await _checkout(source_id, data_source_type, config)
+    entry.active += 1
+    try:
+        yield entry.connector
+    finally:
+        entry.active -= 1
+        entry.last_used = time.monotonic()
+        if entry.retired and entry.active == 0:
+            await _retire(entry)
+
+
+async def release_connector(source_id: str) -> None:
+    """Remove a data source's connector from the pool, closing it once it is idle."""
+    entry = _connector_pool.pop(source_id, None)
+    if entry is not None:
+        await _retire(entry)
+
+
+async def _evict_over_capacity() -> None:
+    """Release the least recently used connectors beyond the pool size."""
+    excess = len(_connector_pool) - settings.connector_pool_size
+    if excess <= 0:
+        return
+    by_last_use = sorted(_connector_pool.items(), key=lambda item: item[1].last_used)
+    for source_id, entry in by_last_use[:excess]:
+        if _connector_pool.get(source_id) is entry:
+            del _connector_pool[source_id]
+            await _retire(entry)
+
+
+async def _evict_stale() -> None:
+    """Release idle connectors past their idle TTL or whose connection has died."""
+    now = time.monotonic()
+    for source_id, entry in list(_connector_pool.items()):
+        if entry.active:
+            continue
+        if now - entry.last_used > settings.connector_idle_ttl:
+            logger.info("Closing idle connector for data source %s", source_id)
+        else:
+            try:
+                if await entry.connector.ping():
+                    continue
+            except Exception as e:
+                logger.debug("Connector ping failed: %s", e)
+            logger.warning("Closing dead connector for data source %s", source_id)
+        if _connector_pool.get(source_id) is entry:
+            del _connector_pool[source_id]
+            await _retire(entry)
+
+
+async def _maintain_pool() -> None:
+    """Periodically evict stale connectors from the pool."""
+    while True:
+        await asyncio.sleep(settings.connector_check_interval)
+        try:
+            await _evict_stale()
+        except Exception as e:
+            logger.warning("Connector pool maintenance failed: %s", e)
+
+
+def start_pool_maintenance() -> None:
+    """Start evicting idle and dead connectors in the background. Call once at startup."""
+    global _maintenance_task
+    if settings.connector_check_interval > 0 and _maintenance_task is None:
+        _maintenance_task = asyncio.create_task(_maintain_pool())
+
+
+def _create_connector(data_source_type: DataSourceType, config: ConnectionConfig) -> BaseConnector:
+    """Factory function to create the appropriate connector for a data source type."""
     
     connector_map: dict[DataSourceType, Type[BaseConnector]] = {}
     
@@ -33,15 +167,64 @@ def get_connector(data_source_type: DataSourceType, config: ConnectionConfig) ->
     elif data_source_type == DataSourceType.SQLITE:
         # SQLite uses the same connector approach as PostgreSQL
         from app.connectors.postgresql import PostgreSQLConnector
-        # Modify config for SQLite
-        config.connection_string = f"sqlite:///{config.database}"
+        # Modify a copy of the config for SQLite so the caller's config (and pool key) is unchanged
+        config = config.model_copy(update={"connection_string": f"sqlite:///{config.database}"})
         return PostgreSQLConnector(config)
     
     else:
         raise ValueError(f"Unsupported data source type: {data_source_type}")
 
 
+# Connector classes are resolved on first access so their drivers (asyncpg, motor,
+# duckdb, ...) are only imported when that connector is actually used
+_LAZY_CONNECTORS = {
+    "PostgreSQLConnector": "app.connectors.postgresql",
+    "MySQLConnector": "app.connectors.mysql",
+    "MongoDBConnector": "app.connectors.mongodb",
+    "CSVConnector": "app.connectors.csv_connector",
+    "RESTAPIConnector": "app.connectors.rest_api",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_CONNECTORS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
+
+
+async def close_connectors() -> None:
+    """Close pooled connectors and connection resources shared across them."""
+    global _maintenance_task
+    if _maintenance_task is not None:
+        _maintenance_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await _maintenance_task
+        _maintenance_task = None
+    
+    entries = list(_connector_pool.values())
+    _connector_pool.clear()
+    for entry in entries:
+        await _retire(entry)
+    
+    # Only connector modules that were actually imported hold shared resources
+    mongodb = sys.modules.get("app.connectors.mongodb")
+    if mongodb is not None:
+        mongodb.close_clients()
+    rest_api = sys.modules.get("app.connectors.rest_api")
+    if rest_api is not None:
+        await rest_api.close_clients()
+
+
 __all__ = [
     "BaseConnector",
-    "get_connector",
+    "PostgreSQLConnector",
+    "MySQLConnector",
+    "MongoDBConnector",
+    "CSVConnector",
+    "RESTAPIConnector",
+    "use_connector",
+    "release_connector",
+    "start_pool_maintenance",
+    "close_connectors",
 ]
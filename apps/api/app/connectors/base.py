@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
+import re
+import time
 from typing import Any, Dict, List, Optional, Tuple
 import logging
 
+from app.core.config import settings
 from app.models import (
     DataSourceType,
     ConnectionConfig,
@@ -13,6 +17,50 @@ from app.models import (
 
 logger = logging.getLogger(__name__)
 
+# Checked in order; the first keyword found in the lowercased type name wins
+_SQL_TYPE_RULES = (
+    ('int', 'integer'),
+    ('serial', 'integer'),
+    ('float', 'number'),
+    ('double', 'number'),
+    ('decimal', 'number'),
+    ('numeric', 'number'),
+    ('real', 'number'),
+    ('bool', 'boolean'),
+    ('date', 'date'),
+    ('time', 'datetime'),
+    ('json', 'json'),
+    ('uuid', 'uuid'),
+    ('array', 'array'),
+)
+
+
+@lru_cache(maxsize=512)
+def _map_sql_type(sql_type: str) -> str:
+    """Map a SQL type name to a common type."""
+    sql_type = sql_type.lower()
+    for keyword, common_type in _SQL_TYPE_RULES:
+        if keyword in sql_type:
+            return common_type
+    return 'string'
+
+
+# Connection pool sizes for SQL connectors when the config does not set them
+_DEFAULT_MIN_POOL_SIZE = 5
+_DEFAULT_MAX_POOL_SIZE = 25
+
+_SELECT_RE = re.compile(r"^\s*select\b", re.IGNORECASE)
+# A LIMIT of a number, ALL, a bind parameter ($1, %s, ?, :name) or a subquery
+_HAS_LIMIT_RE = re.compile(r"\blimit\s+(?:\d|all\b|\$\d|%s|\?|:\w|\()", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def _add_limit(query: str, limit: int) -> str:
+    """Append a LIMIT clause to a SELECT query that does not have one."""
+    if _SELECT_RE.match(query) and not _HAS_LIMIT_RE.search(query):
+        return f"{query.rstrip().rstrip(';')} LIMIT {limit}"
+    return query
+
 
 class BaseConnector(ABC):
     """Abstract base class for all data source connectors."""
@@ -20,6 +68,7 @@ class BaseConnector(ABC):
     def __init__(self, config: ConnectionConfig):
         self.config = config
         self._connection = None
+        self._schema_cache: Optional[Tuple[float, DatabaseSchema]] = None
     
     @abstractmethod
     async def connect(self) -> bool:
@@ -39,6 +88,10 @@ class BaseConnector(ABC):
         """
         pass
     
+    async def ping(self) -> bool:
+        """Check that the connector's open connections are still usable."""
+        return True
+    
     @abstractmethod
     async def get_schema(self) -> DatabaseSchema:
         """Get the complete schema of the data source."""
@@ -64,8 +117,29 @@ class BaseConnector(ABC):
         """
         pass
     
+    def _get_cached_schema(self) -> Optional[DatabaseSchema]:
+        """Get the schema cached by a previous get_schema call, if it has not expired."""
+        if self._schema_cache is None:
+            return None
+        
+        cached_at, schema = self._schema_cache
+        if time.monotonic() - cached_at >= settings.schema_cache_ttl:
+            self._schema_cache = None
+            return None
+        return schema
+    
+    def _cache_schema(self, schema: DatabaseSchema) -> DatabaseSchema:
+        """Cache an introspected schema for reuse by later get_schema calls."""
+        if settings.schema_cache_ttl > 0:
+            self._schema_cache = (time.monotonic(), schema)
+        return schema
+    
+    def invalidate_schema(self) -> None:
+        """Drop the cached schema so the next get_schema call re-introspects."""
+        self._schema_cache = None
+    
     async def get_table_count(self, table_name: str) -> int:
-        """Get the row count of a table."""
+        """Get the row count of a table; connectors override this with cheaper native counts."""
         columns, rows, _ = await self.execute_query(
             f"SELECT COUNT(*) FROM {table_name}", limit=1
         )
@@ -84,38 +158,60 @@ class BaseConnector(ABC):
 class SQLConnector(BaseConnector):
     """Base class for SQL-based connectors (PostgreSQL, MySQL, etc.)."""
     
+    # Character used to quote identifiers (ANSI SQL default)
+    IDENTIFIER_QUOTE = '"'
+    
     def _map_sql_type(self, sql_type: str) -> str:
         """Map SQL types to common types."""
-        sql_type = sql_type.lower()
+        return _map_sql_type(sql_type)
+    
+    def _pool_sizes(self) -> Tuple[int, int]:
+        """Get the (min, max) connection pool sizes from config, with defaults."""
+        max_size = self.config.max_pool_size or _DEFAULT_MAX_POOL_SIZE
+        min_size = self.config.min_pool_size
+        if min_size is None:
+            min_size = _DEFAULT_MIN_POOL_SIZE
+        return min(min_size, max_size), max_size
+    
+    def _add_limit(self, query: str, limit: int) -> str:
+        """Add a LIMIT clause to SELECT queries that do not have one."""
+        return _add_limit(query, limit)
+    
+    def _quote_identifier(self, name: str) -> str:
+        """Quote a single identifier, escaping embedded quote characters."""
+        quote = self.IDENTIFIER_QUOTE
+        return f"{quote}{name.replace(quote, quote * 2)}{quote}"
+    
+    def _quote_table(self, table_name: str) -> str:
+        """Quote a (possibly schema-qualified) table name for use in SQL."""
+        # Reject names that the cached schema does not know about
+        schema = self._get_cached_schema()
+        if schema is not None:
+            name = table_name.rsplit(".", 1)[-1]
+            if not any(table.name == name for table in schema.tables):
+                raise ValueError(f"Unknown table: {table_name}")
         
-        if any(t in sql_type for t in ['int', 'serial', 'bigint', 'smallint']):
-            return 'integer'
-        elif any(t in sql_type for t in ['float', 'double', 'decimal', 'numeric', 'real']):
-            return 'number'
-        elif any(t in sql_type for t in ['bool']):
-            return 'boolean'
-        elif any(t in sql_type for t in ['date']):
-            return 'date'
-        elif any(t in sql_type for t in ['time', 'timestamp']):
-            return 'datetime'
-        elif any(t in sql_type for t in ['json', 'jsonb']):
-            return 'json'
-        elif any(t in sql_type for t in ['uuid']):
-            return 'uuid'
-        elif any(t in sql_type for t in ['array']):
-            return 'array'
-        else:
-            return 'string'
+        return ".".join(self._quote_identifier(part) for part in table_name.split("."))
+    
+    async def get_table_count(self, table_name: str) -> int:
+        """Get the row count of a table with COUNT(*)."""
+        columns, rows, _ = await self.execute_query(
+            f"SELECT COUNT(*) FROM {self._quote_table(table_name)}", limit=1
+        )
+        if rows and rows[0]:
+            return rows[0][0]
+        return 0
     
     async def get_sample_data(
         self, table_name: str, sample_size: int = 100, random_sample: bool = True
     ) -> Tuple[List[QueryColumn], List[List[Any]]]:
         """Get sample data using SQL."""
+        table = self._quote_table(table_name)
         if random_sample:
             # Most SQL databases support ORDER BY RANDOM() or similar
-            query = f"SELECT * FROM {table_name} ORDER BY RANDOM() LIMIT {sample_size}"
+            query = f"SELECT * FROM {table} ORDER BY RANDOM() LIMIT {sample_size}"
         else:
-            query = f"SELECT * FROM {table_name} LIMIT {sample_size}"
+            query = f"SELECT * FROM {table} LIMIT {sample_size}"
         
         columns, rows, _ = await self.execute_query(query, limit=sample_size)
         return columns, rows
@@ -1,11 +1,22 @@
+import asyncio
+import os
+import re
 import time
 import io
+import tempfile
+from functools import lru_cache
 from typing import Any, List, Optional, Tuple
 import logging
 
-import pandas as pd
+import duckdb
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as pads
 import httpx
 
+from app.core.cache import LRUCache, normalize_query
+from app.core.config import settings
 from app.models import (
     ConnectionConfig,
     TableSchema,
@@ -17,48 +28,136 @@ from app.connectors.base import BaseConnector
 
 logger = logging.getLogger(__name__)
 
+# Shared across connector instances, since a new connector is created per request
+_query_cache = LRUCache(maxsize=settings.query_cache_size)
+
+# Query shapes, matched in a single pass without lowercasing the query
+_SELECT_ALL_RE = re.compile(r"^\s*select\s+\*\s*;?\s*$", re.IGNORECASE)
+_STATEMENT_RE = re.compile(r"^\s*(?:select|with)\b", re.IGNORECASE)
+
+# test_connection only needs enough of a remote file to parse its first batch
+_TEST_READ_BYTES = 1 << 20
+
+
+@lru_cache(maxsize=128)
+def _arrow_type_to_string(arrow_type: pa.DataType) -> str:
+    """Convert an Arrow data type to a string type."""
+    if pa.types.is_integer(arrow_type):
+        return 'integer'
+    elif pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        return 'number'
+    elif pa.types.is_boolean(arrow_type):
+        return 'boolean'
+    elif pa.types.is_timestamp(arrow_type):
+        return 'datetime'
+    elif pa.types.is_date(arrow_type):
+        return 'date'
+    else:
+        return 'string'
+
 
 class CSVConnector(BaseConnector):
     """Connector for CSV files."""
     
+    # CSV data is exposed to SQL as a single table with this name
+    TABLE_NAME = "data"
+    
+    # Fixed seed so repeated samples of the same file return the same rows
+    SAMPLE_SEED = 42
+    
+    # Files up to this size are loaded into memory once; larger ones are scanned per query
+    MATERIALIZE_MAX_BYTES = 50 * 1024 * 1024
+    
     def __init__(self, config: ConnectionConfig):
         super().__init__(config)
-        self._dataframe: Optional[pd.DataFrame] = None
+        self._temp_path: Optional[str] = None
+        self._con: Optional[duckdb.DuckDBPyConnection] = None
+        self._dataset: Optional[pads.Dataset] = None
+        self._cache_scope: Optional[Tuple] = None
+        self._cache_ttl: Optional[int] = None
+        # Pooled connectors are shared, so concurrent first requests must connect only once
+        self._connect_lock = asyncio.Lock()
     
     async def connect(self) -> bool:
-        """Load the CSV file into memory."""
+        """Open the CSV source as a DuckDB view."""
         try:
             if self.config.file_path:
-                self._dataframe = pd.read_csv(self.config.file_path)
+                if not os.path.exists(self.config.file_path):
+                    raise FileNotFoundError(f"File not found: {self.config.file_path}")
+                source_path = self.config.file_path
+                # A changed file gets a new scope, which invalidates its cached results
+                stat = os.stat(source_path)
+                self._cache_scope = ("file", source_path, stat.st_mtime_ns, stat.st_size)
+                self._cache_ttl = None
             elif self.config.file_url:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(self.config.file_url)
-                    response.raise_for_status()
-                    self._dataframe = pd.read_csv(io.StringIO(response.text))
+                # Stream the download to a temp file so the full text is never held in memory
+                with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+                    self._temp_path = tmp.name
+                    async with httpx.AsyncClient() as client:
+                        async with client.stream("GET", self.config.file_url) as response:
+                            response.raise_for_status()
+                            async for chunk in response.aiter_bytes():
+                                tmp.write(chunk)
+                source_path = self._temp_path
+                # Remote files can change without notice, so their results expire
+                self._cache_scope = ("url", self.config.file_url)
+                self._cache_ttl = settings.query_cache_ttl
             else:
                 raise ValueError("Either file_path or file_url must be provided")
             
-            logger.info(f"CSV loaded with {len(self._dataframe)} rows")
+            # Small files are parsed once into a table; large ones are scanned lazily
+            # through an Arrow dataset, so filters and limits are pushed into the scan
+            con = duckdb.connect()
+            try:
+                if os.path.getsize(source_path) <= self.MATERIALIZE_MAX_BYTES:
+                    escaped_path = source_path.replace("'", "''")
+                    con.execute(
+                        f"CREATE TABLE {self.TABLE_NAME} AS "
+                        f"SELECT * FROM read_csv_auto('{escaped_path}')"
+                    )
+                    if self._temp_path:
+                        # The downloaded file is no longer needed once loaded
+                        os.unlink(self._temp_path)
+                        self._temp_path = None
+                else:
+                    # Arrow reads the file itself, so the scan still works once DuckDB's
+                    # own file access is disabled below
+                    self._dataset = pads.dataset(source_path, format="csv")
+                self._lock_down(con)
+            except Exception:
+                con.close()
+                raise
+            # Published only once fully loaded, so no request sees a half-built source
+            self._con = con
+            
+            logger.info("CSV source opened: %s", source_path)
             return True
         except Exception as e:
-            logger.error(f"Failed to load CSV: {e}")
+            logger.error("Failed to load CSV: %s", e)
+            await self.disconnect()
             raise
     
     async def disconnect(self) -> None:
-        """Clear the dataframe from memory."""
-        self._dataframe = None
+        """Close the DuckDB connection and remove any downloaded file."""
+        if self._con:
+            self._con.close()
+            self._con = None
+        self._dataset = None
+        if self._temp_path:
+            try:
+                os.unlink(self._temp_path)
+            except OSError:
+                pass
+            self._temp_path = None
         logger.info("CSV connection closed")
     
     async def test_connection(self) -> Tuple[bool, Optional[str]]:
         """Test the CSV connection by trying to load the file."""
         try:
             if self.config.file_path:
-                pd.read_csv(self.config.file_path, nrows=1)
+                pacsv.open_csv(self.config.file_path).read_next_batch()
             elif self.config.file_url:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(self.config.file_url, timeout=10)
-                    response.raise_for_status()
-                    pd.read_csv(io.StringIO(response.text), nrows=1)
+                pacsv.open_csv(io.BytesIO(await self._read_url_head())).read_next_batch()
             else:
                 return False, "Either file_path or file_url must be provided"
             return True, None
@@ -66,50 +165,164 @@ class CSVConnector(BaseConnector):
             return False, f"File not found: {self.config.file_path}"
         except httpx.HTTPError as e:
             return False, f"HTTP error: {str(e)}"
-        except pd.errors.EmptyDataError:
+        except StopIteration:
             return False, "CSV file is empty"
-        except pd.errors.ParserError as e:
+        except pa.ArrowInvalid as e:
+            if "Empty CSV file" in str(e):
+                return False, "CSV file is empty"
             return False, f"CSV parsing error: {str(e)}"
         except Exception as e:
             return False, str(e)
     
-    def _pandas_type_to_string(self, dtype: str) -> str:
-        """Convert pandas dtype to a string type."""
-        dtype_str = str(dtype).lower()
-        if 'int' in dtype_str:
-            return 'integer'
-        elif 'float' in dtype_str:
-            return 'number'
-        elif 'bool' in dtype_str:
-            return 'boolean'
-        elif 'datetime' in dtype_str:
-            return 'datetime'
-        elif 'date' in dtype_str:
-            return 'date'
-        else:
-            return 'string'
+    async def _read_url_head(self) -> bytes:
+        """Download only the start of the remote CSV, cut at the last complete line."""
+        head = bytearray()
+        async with httpx.AsyncClient() as client:
+            async with client.stream("GET", self.config.file_url, timeout=10) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    head += chunk
+                    if len(head) >= _TEST_READ_BYTES:
+                        # Leaving the stream early closes it instead of downloading the rest
+                        last_newline = head.rfind(b"\n")
+                        if last_newline != -1:
+                            del head[last_newline + 1:]
+                        break
+        return bytes(head)
+    
+    def _arrow_type_to_string(self, arrow_type: pa.DataType) -> str:
+        """Convert an Arrow data type to a string type."""
+        return _arrow_type_to_string(arrow_type)
+    
+    def _query_columns(self, schema: pa.Schema) -> List[QueryColumn]:
+        """Build query column metadata from an Arrow schema."""
+        return [
+            QueryColumn(name=field.name, type=self._arrow_type_to_string(field.type))
+            for field in schema
+        ]
+    
+    def _to_rows(self, table: pa.Table) -> List[List[Any]]:
+        """Convert an Arrow table to a list of row lists."""
+        # Convert column by column (typed fast paths) instead of building a dict per row
+        return list(map(list, zip(*(column.to_pylist() for column in table.columns))))
+    
+    def _lock_down(self, con: duckdb.DuckDBPyConnection) -> None:
+        """Restrict a loaded connection to the CSV data, so queries cannot read or write files."""
+        con.execute("SET enable_external_access = false")
+        # Nothing may switch file access back on
+        con.execute("SET lock_configuration = true")
+    
+    def _file_changed(self) -> bool:
+        """Check whether a local CSV file changed since it was loaded."""
+        if not self.config.file_path or self._cache_scope is None:
+            return False
+        stat = os.stat(self.config.file_path)
+        return self._cache_scope[2:] != (stat.st_mtime_ns, stat.st_size)
+    
+    async def _ensure_connected(self) -> None:
+        """Connect on first use, and reload a local file that changed since it was loaded."""
+        if self._con is not None and not self._file_changed():
+            return
+        # Once even when several requests arrive together
+        async with self._connect_lock:
+            if self._con is None:
+                await self.connect()
+            elif self._file_changed():
+                logger.info("CSV file changed, reloading: %s", self.config.file_path)
+                # Cursors of queries still running keep the previous database alive
+                # until they close, so it is dropped rather than closed here
+                self._con = None
+                self._dataset = None
+                await self.connect()
+    
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        """Open a cursor for one call on the shared in-memory database."""
+        # A DuckDB connection is not safe to use from several threads at once, but
+        # each cursor is its own connection to the same database
+        cursor = self._con.cursor()
+        if self._dataset is not None:
+            # Registered objects are only visible to the connection they are registered on
+            cursor.register(self.TABLE_NAME, self._dataset)
+        return cursor
+    
+    def _check_single_select(self, cursor: duckdb.DuckDBPyConnection, sql: str) -> None:
+        """Reject anything but exactly one SELECT statement."""
+        # json_serialize_sql parses without executing and only accepts SELECT statements
+        parsed = orjson.loads(
+            cursor.execute("SELECT json_serialize_sql(?::VARCHAR)", [sql]).fetchone()[0]
+        )
+        if parsed.get("error_type") == "parser":
+            raise ValueError(f"Invalid SQL: {parsed.get('error_message')}")
+        if parsed.get("error") or len(parsed.get("statements", ())) != 1:
+            raise ValueError("Only a single SELECT query is allowed")
+    
+    def _fetch(self, cursor: duckdb.DuckDBPyConnection, sql: str, limit: int) -> pa.Table:
+        """Run a SQL statement on a cursor and fetch at most `limit` rows as an Arrow table."""
+        try:
+            self._check_single_select(cursor, sql)
+            relation = cursor.sql(sql)
+            if relation is None:
+                raise ValueError("Query did not return any results")
+            return relation.limit(limit).fetch_arrow_table()
+        finally:
+            cursor.close()
+    
+    async def _run(self, sql: str, limit: int, timeout: Optional[int] = None) -> pa.Table:
+        """Run a SQL statement off the event loop, interrupting it on timeout."""
+        cursor = self._cursor()
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(self._fetch, cursor, sql, limit),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            # Only this call's cursor is interrupted, not other requests' queries
+            try:
+                cursor.interrupt()
+            except duckdb.ConnectionException:
+                # The query finished and closed its cursor in the meantime
+                pass
+            raise TimeoutError(f"Query timed out after {timeout} seconds")
+    
+    def _scan_schema(self, cursor: duckdb.DuckDBPyConnection) -> Tuple[pa.Schema, int, List[int]]:
+        """Get the Arrow schema, row count and per-column non-null counts in one scan."""
+        try:
+            schema = cursor.sql(f"SELECT * FROM {self.TABLE_NAME}").limit(0).fetch_arrow_table().schema
+            # COLUMNS(*) expands to one count per column, in schema order
+            row = cursor.execute(
+                f"SELECT count(*), count(COLUMNS(*)) FROM {self.TABLE_NAME}"
+            ).fetchone()
+            return schema, row[0], list(row[1:])
+        finally:
+            cursor.close()
+    
+    def _count_rows(self, cursor: duckdb.DuckDBPyConnection) -> int:
+        """Count the rows of the CSV data."""
+        try:
+            return cursor.execute(f"SELECT count(*) FROM {self.TABLE_NAME}").fetchone()[0]
+        finally:
+            cursor.close()
     
     async def get_schema(self) -> DatabaseSchema:
         """Get the schema of the CSV file."""
-        if self._dataframe is None:
-            await self.connect()
+        await self._ensure_connected()
         
-        columns = []
-        for col_name in self._dataframe.columns:
-            columns.append(
-                ColumnSchema(
-                    name=str(col_name),
-                    type=self._pandas_type_to_string(self._dataframe[col_name].dtype),
-                    nullable=self._dataframe[col_name].isna().any(),
-                    primary_key=False,
-                )
+        schema, row_count, non_null_counts = await asyncio.to_thread(self._scan_schema, self._cursor())
+        
+        columns = [
+            ColumnSchema(
+                name=field.name,
+                type=self._arrow_type_to_string(field.type),
+                nullable=non_null_counts[i] < row_count,
+                primary_key=False,
             )
+            for i, field in enumerate(schema)
+        ]
         
-        # CSV is treated as a single table named 'data'
         table_schema = TableSchema(
-            name="data",
+            name=self.TABLE_NAME,
             columns=columns,
-            row_count=len(self._dataframe),
+            row_count=row_count,
         )
         
         return DatabaseSchema(tables=[table_schema])
@@ -118,118 +331,68 @@ class CSVConnector(BaseConnector):
         self, query: str, limit: int = 100, timeout: int = 30
     ) -> Tuple[List[QueryColumn], List[List[Any]], int]:
         """
-        Execute a query on the CSV data using pandas query syntax.
-        Supports pandas query() syntax or column selections.
+        Execute a SQL query on the CSV data with DuckDB.
+        The CSV is exposed as a table named `data`; a bare filter expression
+        (e.g. `amount > 10 and region == 'EU'`) is treated as a WHERE clause.
         """
-        if self._dataframe is None:
-            await self.connect()
+        await self._ensure_connected()
         
         start_time = time.time()
         
+        cache_key = (self._cache_scope, normalize_query(query), limit)
+        cached = _query_cache.get(cache_key)
+        if cached is not None:
+            columns, rows = cached
+            # Cached rows are stored as tuples; callers get lists of their own
+            return columns, list(map(list, rows)), int((time.time() - start_time) * 1000)
+        
         try:
-            # Try to parse as a pandas query
-            if query.strip().lower() == 'select *':
-                result_df = self._dataframe.head(limit)
-            elif query.strip().startswith('SELECT') or query.strip().startswith('select'):
-                # Simple SQL-like SELECT parsing
-                result_df = self._simple_sql_parse(query, limit)
+            if _SELECT_ALL_RE.match(query):
+                sql = f"SELECT * FROM {self.TABLE_NAME}"
+            elif _STATEMENT_RE.match(query):
+                sql = query.strip().rstrip(';')
             else:
-                # Use pandas query syntax
-                result_df = self._dataframe.query(query).head(limit)
+                sql = f"SELECT * FROM {self.TABLE_NAME} WHERE {query.strip().rstrip(';')}"
+            
+            result = await self._run(sql, limit, timeout)
             
             execution_time_ms = int((time.time() - start_time) * 1000)
             
-            columns = [
-                QueryColumn(name=str(col), type=self._pandas_type_to_string(result_df[col].dtype))
-                for col in result_df.columns
-            ]
+            columns = self._query_columns(result.schema)
+            rows = self._to_rows(result)
             
-            rows = result_df.values.tolist()
+            _query_cache.set(cache_key, (columns, tuple(map(tuple, rows))), ttl=self._cache_ttl)
             
             return columns, rows, execution_time_ms
-            
+        
         except Exception as e:
-            logger.error(f"CSV query failed: {e}")
+            logger.error("CSV query failed: %s", e)
             raise
     
-    def _simple_sql_parse(self, query: str, limit: int) -> pd.DataFrame:
-        """Parse simple SQL-like queries for CSV data."""
-        query = query.strip()
-        
-        # Remove SELECT keyword
-        if query.upper().startswith('SELECT'):
-            query = query[6:].strip()
-        
-        # Handle SELECT *
-        if query.startswith('*'):
-            query = query[1:].strip()
-            if query.upper().startswith('FROM'):
-                query = query[4:].strip()
-                # Remove table name
-                parts = query.split()
-                if parts:
-                    query = ' '.join(parts[1:]) if len(parts) > 1 else ''
-            
-            if query.upper().startswith('WHERE'):
-                where_clause = query[5:].strip()
-                # Handle LIMIT in WHERE
-                if 'LIMIT' in where_clause.upper():
-                    limit_idx = where_clause.upper().index('LIMIT')
-                    limit_str = where_clause[limit_idx + 5:].strip().split()[0]
-                    limit = int(limit_str)
-                    where_clause = where_clause[:limit_idx].strip()
-                
-                if where_clause:
-                    return self._dataframe.query(where_clause).head(limit)
-            
-            return self._dataframe.head(limit)
-        
-        # Handle specific columns
-        columns_part = query
-        where_clause = None
-        
-        if 'FROM' in query.upper():
-            from_idx = query.upper().index('FROM')
-            columns_part = query[:from_idx].strip()
-            rest = query[from_idx + 4:].strip()
-            
-            if 'WHERE' in rest.upper():
-                where_idx = rest.upper().index('WHERE')
-                where_clause = rest[where_idx + 5:].strip()
-        
-        # Parse columns
-        columns = [c.strip() for c in columns_part.split(',')]
-        
-        df = self._dataframe[columns] if columns != ['*'] else self._dataframe
-        
-        if where_clause:
-            if 'LIMIT' in where_clause.upper():
-                limit_idx = where_clause.upper().index('LIMIT')
-                limit = int(where_clause[limit_idx + 5:].strip().split()[0])
-                where_clause = where_clause[:limit_idx].strip()
-            if where_clause:
-                df = df.query(where_clause)
-        
-        return df.head(limit)
-    
     async def get_sample_data(
         self, table_name: str, sample_size: int = 100, random_sample: bool = True
     ) -> Tuple[List[QueryColumn], List[List[Any]]]:
         """Get sample data from the CSV."""
-        if self._dataframe is None:
-            await self.connect()
+        await self._ensure_connected()
         
         if random_sample:
-            sample_size = min(sample_size, len(self._dataframe))
-            sample_df = self._dataframe.sample(n=sample_size)
+            # Reservoir sampling draws the rows in one scan with memory bounded by the sample size
+            sql = (
+                f"SELECT * FROM {self.TABLE_NAME} "
+                f"USING SAMPLE reservoir({int(sample_size)} ROWS) REPEATABLE ({self.SAMPLE_SEED})"
+            )
         else:
-            sample_df = self._dataframe.head(sample_size)
+            sql = f"SELECT * FROM {self.TABLE_NAME}"
         
-        columns = [
-            QueryColumn(name=str(col), type=self._pandas_type_to_string(sample_df[col].dtype))
-            for col in sample_df.columns
-        ]
+        sample = await self._run(sql, sample_size)
         
-        rows = sample_df.values.tolist()
+        columns = self._query_columns(sample.schema)
+        rows = self._to_rows(sample)
         
         return columns, rows
+    
+    async def get_table_count(self, table_name: str) -> int:
+        """Get the row count of the CSV data."""
+        await self._ensure_connected()
+        
+        return await asyncio.to_thread(self._count_rows, self._cursor())
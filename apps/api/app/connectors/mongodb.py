@@ -1,8 +1,15 @@
+import asyncio
+import json
 import time
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Tuple
 import logging
+import orjson
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from app.core.cache import LRUCache, normalize_query
+from app.core.config import settings
 from app.models import (
     ConnectionConfig,
     TableSchema,
@@ -14,6 +21,38 @@ from app.connectors.base import BaseConnector
 
 logger = logging.getLogger(__name__)
 
+# Shared across connector instances, since a new connector is created per request
+_query_cache = LRUCache(maxsize=settings.query_cache_size)
+
+# Motor clients (and their connection pools) shared across connector instances,
+# keyed by connection string
+_clients: Dict[str, AsyncIOMotorClient] = {}
+
+# Pipeline stages that write their results and must come last
+_OUTPUT_STAGES = ("$out", "$merge")
+
+# Used only to split a filter from a trailing projection, which orjson cannot do
+_json_decoder = json.JSONDecoder()
+
+# Max collections introspected concurrently in get_schema
+_SCHEMA_CONCURRENCY = 16
+
+# Exact-type lookup for inferred value types; bool comes before int for the subclass fallback
+_VALUE_TYPES: Dict[type, str] = {
+    type(None): "null",
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    str: "string",
+    list: "array",
+    dict: "object",
+}
+
+
+def _to_cell(value: Any) -> Any:
+    """Convert a document value to a JSON-serializable cell."""
+    return str(value) if type(value) is ObjectId else value
+
 
 class MongoDBConnector(BaseConnector):
     """Connector for MongoDB databases."""
@@ -22,11 +61,16 @@ class MongoDBConnector(BaseConnector):
         super().__init__(config)
         self._client: Optional[AsyncIOMotorClient] = None
         self._db = None
+        self._connection_string: Optional[str] = None
     
     def _build_connection_string(self) -> str:
         """Build the MongoDB connection string from config."""
+        if self._connection_string is not None:
+            return self._connection_string
+        
         if self.config.connection_string:
-            return self.config.connection_string
+            self._connection_string = self.config.connection_string
+            return self._connection_string
         
         user = self.config.username
         password = self.config.password
@@ -35,14 +79,29 @@ class MongoDBConnector(BaseConnector):
         database = self.config.database or "test"
         
         if user and password:
-            return f"mongodb://{user}:{password}@{host}:{port}/{database}"
-        return f"mongodb://{host}:{port}/{database}"
+            self._connection_string = f"mongodb://{user}:{password}@{host}:{port}/{database}"
+        else:
+            self._connection_string = f"mongodb://{host}:{port}/{database}"
+        return self._connection_string
+    
+    def _get_client(self, connection_string: str) -> AsyncIOMotorClient:
+        """Get the shared client for a connection string, creating it on first use."""
+        client = _clients.get(connection_string)
+        if client is None:
+            client = AsyncIOMotorClient(
+                connection_string,
+                maxPoolSize=self.config.max_pool_size or 100,
+                minPoolSize=self.config.min_pool_size or 0,
+                serverSelectionTimeoutMS=5000,
+            )
+            _clients[connection_string] = client
+        return client
     
     async def connect(self) -> bool:
         """Establish connection to MongoDB."""
         try:
             connection_string = self._build_connection_string()
-            self._client = AsyncIOMotorClient(connection_string)
+            self._client = self._get_client(connection_string)
             self._db = self._client[self.config.database or "test"]
             
             # Verify connection
@@ -50,26 +109,26 @@ class MongoDBConnector(BaseConnector):
             logger.info("MongoDB connection established")
             return True
         except Exception as e:
-            logger.error(f"Failed to connect to MongoDB: {e}")
+            logger.error("Failed to connect to MongoDB: %s", e)
             raise
     
     async def disconnect(self) -> None:
-        """Close the MongoDB connection."""
-        if self._client:
-            self._client.close()
+        """Release this connector's handle; the shared client stays open for reuse."""
+        if self._client is not None:
             self._client = None
             self._db = None
-            logger.info("MongoDB connection closed")
+            logger.info("MongoDB connection released")
     
     async def test_connection(self) -> Tuple[bool, Optional[str]]:
         """Test the connection to MongoDB."""
+        connection_string = self._build_connection_string()
         try:
-            connection_string = self._build_connection_string()
-            client = AsyncIOMotorClient(connection_string, serverSelectionTimeoutMS=5000)
+            client = self._get_client(connection_string)
             await client.admin.command('ping')
-            client.close()
             return True, None
         except Exception as e:
+            # The client is shared with other connectors for this connection string,
+            # so it is left open here and closed by close_clients() at shutdown
             error_str = str(e)
             if "Authentication failed" in error_str:
                 return False, "Invalid username or password"
@@ -77,91 +136,158 @@ class MongoDBConnector(BaseConnector):
                 return False, f"Could not connect to server at {self.config.host}:{self.config.port}"
             return False, error_str
     
+    async def ping(self) -> bool:
+        """Check that the shared client can still reach MongoDB."""
+        if self._client is None:
+            return True
+        await self._client.admin.command('ping')
+        return True
+    
     def _infer_type_from_value(self, value: Any) -> str:
         """Infer the data type from a value."""
-        if value is None:
-            return "null"
-        elif isinstance(value, bool):
-            return "boolean"
-        elif isinstance(value, int):
-            return "integer"
-        elif isinstance(value, float):
-            return "number"
-        elif isinstance(value, str):
-            return "string"
-        elif isinstance(value, list):
-            return "array"
-        elif isinstance(value, dict):
-            return "object"
+        value_type = type(value)
+        inferred = _VALUE_TYPES.get(value_type)
+        if inferred is None:
+            # Subclasses (e.g. bson.Int64) and other types are resolved once and memoized
+            inferred = next(
+                (name for base, name in _VALUE_TYPES.items() if isinstance(value, base)),
+                "string",
+            )
+            _VALUE_TYPES[value_type] = inferred
+        return inferred
+    
+    def _docs_to_rows(
+        self, docs: List[Dict[str, Any]]
+    ) -> Tuple[List[QueryColumn], List[List[Any]]]:
+        """Convert documents to columns and rows, using the first document as the template."""
+        first_doc = docs[0]
+        names = list(first_doc)
+        columns = [
+            QueryColumn(name=key, type=self._infer_type_from_value(value))
+            for key, value in first_doc.items()
+        ]
+        
+        # Every cell is converted, since any document may hold an ObjectId in any field
+        if len(names) == 1:
+            name = names[0]
+            rows = [[_to_cell(doc.get(name))] for doc in docs]
         else:
-            return "string"
+            get_fields = itemgetter(*names)
+            try:
+                rows = [[_to_cell(value) for value in get_fields(doc)] for doc in docs]
+            except KeyError:
+                # Documents missing some fields take the per-field path
+                rows = [[_to_cell(doc.get(name)) for name in names] for doc in docs]
+        
+        return columns, rows
+    
+    async def _introspect_collection(
+        self, collection_name: str, semaphore: asyncio.Semaphore
+    ) -> TableSchema:
+        """Infer the schema of a single collection by sampling documents."""
+        collection = self._db[collection_name]
+        
+        async with semaphore:
+            # Count from collection metadata and sample documents concurrently;
+            # $sample returns every document when the collection is smaller than the size
+            row_count, sample_docs = await asyncio.gather(
+                collection.estimated_document_count(),
+                collection.aggregate([{"$sample": {"size": 100}}]).to_list(100),
+            )
+        
+        # Infer columns from sampled documents
+        field_types: Dict[str, set] = {}
+        for doc in sample_docs:
+            for key, value in doc.items():
+                if key not in field_types:
+                    field_types[key] = set()
+                field_types[key].add(self._infer_type_from_value(value))
+        
+        columns = []
+        for field_name, types in field_types.items():
+            # Use the most common type, or 'mixed' if multiple
+            if len(types) == 1:
+                field_type = types.pop()
+            else:
+                field_type = "mixed"
+            
+            columns.append(
+                ColumnSchema(
+                    name=field_name,
+                    type=field_type,
+                    nullable=True,  # MongoDB fields are always nullable
+                    primary_key=field_name == "_id",
+                )
+            )
+        
+        return TableSchema(
+            name=collection_name,
+            columns=columns,
+            row_count=row_count,
+        )
     
     async def get_schema(self) -> DatabaseSchema:
         """Get the schema of the MongoDB database by sampling documents."""
-        if not self._db:
+        if self._db is None:
             await self.connect()
         
         # Get all collections
         collection_names = await self._db.list_collection_names()
         
-        table_schemas = []
-        for collection_name in collection_names:
-            if collection_name.startswith('system.'):
-                continue
-            
-            collection = self._db[collection_name]
-            
-            # Get document count
-            row_count = await collection.count_documents({})
-            
-            # Sample documents to infer schema
-            sample_docs = await collection.aggregate([
-                {"$sample": {"size": min(100, row_count) if row_count > 0 else 1}}
-            ]).to_list(100)
-            
-            # Infer columns from sampled documents
-            field_types: Dict[str, set] = {}
-            for doc in sample_docs:
-                for key, value in doc.items():
-                    if key not in field_types:
-                        field_types[key] = set()
-                    field_types[key].add(self._infer_type_from_value(value))
-            
-            columns = []
-            for field_name, types in field_types.items():
-                # Use the most common type, or 'mixed' if multiple
-                if len(types) == 1:
-                    field_type = types.pop()
-                else:
-                    field_type = "mixed"
-                
-                columns.append(
-                    ColumnSchema(
-                        name=field_name,
-                        type=field_type,
-                        nullable=True,  # MongoDB fields are always nullable
-                        primary_key=field_name == "_id",
-                    )
-                )
-            
-            table_schemas.append(
-                TableSchema(
-                    name=collection_name,
-                    columns=columns,
-                    row_count=row_count,
-                )
+        # Introspect collections concurrently, bounded so the connection pool isn't exhausted
+        semaphore = asyncio.Semaphore(_SCHEMA_CONCURRENCY)
+        table_schemas = await asyncio.gather(*(
+            self._introspect_collection(collection_name, semaphore)
+            for collection_name in collection_names
+            if not collection_name.startswith('system.')
+        ))
+        
+        return DatabaseSchema(tables=list(table_schemas))
+    
+    def _parse_query_json(self, query_json: str) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """Parse a filter or pipeline, optionally followed by `:{projection_json}`."""
+        if not query_json:
+            return {}, None
+        
+        try:
+            return orjson.loads(query_json), None
+        except orjson.JSONDecodeError:
+            # Not a single JSON document; split off the projection
+            query_dict, end = _json_decoder.raw_decode(query_json)
+        
+        projection_json = query_json[end:].strip()
+        if not projection_json.startswith(':'):
+            raise ValueError(
+                "Query format should be: collection_name:{query_json}[:{projection_json}]"
             )
+        return query_dict, orjson.loads(projection_json[1:])
+    
+    def _build_pipeline(
+        self, stages: List[Any], projection: Optional[Dict[str, Any]], limit: int
+    ) -> List[Any]:
+        """Bound an aggregation pipeline by the projection and row limit."""
+        pipeline = list(stages)
+        last = pipeline[-1] if pipeline and isinstance(pipeline[-1], dict) else {}
+        if any(stage in last for stage in _OUTPUT_STAGES):
+            # No stage may follow $out or $merge, and they return no documents anyway
+            return pipeline
         
-        return DatabaseSchema(tables=table_schemas)
+        if projection and not any("$project" in stage for stage in pipeline):
+            pipeline.append({"$project": projection})
+        last_limit = last.get("$limit")
+        if not (isinstance(last_limit, int) and last_limit <= limit):
+            pipeline.append({"$limit": limit})
+        return pipeline
     
     async def execute_query(
         self, query: str, limit: int = 100, timeout: int = 30
     ) -> Tuple[List[QueryColumn], List[List[Any]], int]:
         """
         Execute a MongoDB query.
-        Query format: collection_name:json_query or collection_name:aggregation_pipeline
+        Query format: collection_name:json_query or collection_name:aggregation_pipeline,
+        optionally followed by :json_projection to limit the fields returned.
         """
-        if not self._db:
+        if self._db is None:
             await self.connect()
         
         start_time = time.time()
@@ -169,25 +295,41 @@ class MongoDBConnector(BaseConnector):
         try:
             # Parse query format: collection_name:query_json
             if ':' not in query:
-                raise ValueError("Query format should be: collection_name:{query_json}")
+                raise ValueError(
+                    "Query format should be: collection_name:{query_json}[:{projection_json}]"
+                )
             
             collection_name, query_json = query.split(':', 1)
             collection_name = collection_name.strip()
             query_json = query_json.strip()
             
+            # Collections change underneath us, so cached results expire after a TTL
+            cache_key = (
+                self._build_connection_string(),
+                self.config.database or "test",
+                collection_name,
+                normalize_query(query_json),
+                limit,
+            )
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                columns, rows = cached
+                # Cached rows are stored as tuples; callers get lists of their own
+                return columns, list(map(list, rows)), int((time.time() - start_time) * 1000)
+            
             collection = self._db[collection_name]
             
-            # Parse query JSON
-            import json
-            query_dict = json.loads(query_json) if query_json else {}
+            # Parse query JSON, followed by an optional projection
+            query_dict, projection = self._parse_query_json(query_json)
             
             # Check if it's an aggregation pipeline
             if isinstance(query_dict, list):
-                # Aggregation pipeline
-                cursor = collection.aggregate(query_dict)
+                # Aggregation pipeline; let the server stop after `limit` documents
+                pipeline = self._build_pipeline(query_dict, projection, limit)
+                cursor = collection.aggregate(pipeline, batchSize=limit)
             else:
-                # Regular find query
-                cursor = collection.find(query_dict).limit(limit)
+                # Regular find query, returned in a single batch
+                cursor = collection.find(query_dict, projection).limit(limit).batch_size(limit)
             
             docs = await cursor.to_list(limit)
             
@@ -196,35 +338,21 @@ class MongoDBConnector(BaseConnector):
             if not docs:
                 return [], [], execution_time_ms
             
-            # Extract columns from first document
-            columns = [
-                QueryColumn(name=key, type=self._infer_type_from_value(value))
-                for key, value in docs[0].items()
-            ]
+            columns, rows = self._docs_to_rows(docs)
             
-            # Convert documents to rows
-            rows = []
-            for doc in docs:
-                row = []
-                for col in columns:
-                    value = doc.get(col.name)
-                    # Convert ObjectId to string
-                    if hasattr(value, '__str__') and type(value).__name__ == 'ObjectId':
-                        value = str(value)
-                    row.append(value)
-                rows.append(row)
+            _query_cache.set(cache_key, (columns, tuple(map(tuple, rows))), ttl=settings.query_cache_ttl)
             
             return columns, rows, execution_time_ms
             
         except Exception as e:
-            logger.error(f"MongoDB query failed: {e}")
+            logger.error("MongoDB query failed: %s", e)
             raise
     
     async def get_sample_data(
         self, table_name: str, sample_size: int = 100, random_sample: bool = True
     ) -> Tuple[List[QueryColumn], List[List[Any]]]:
         """Get sample data from a MongoDB collection."""
-        if not self._db:
+        if self._db is None:
             await self.connect()
         
         collection = self._db[table_name]
@@ -241,21 +369,18 @@ class MongoDBConnector(BaseConnector):
         if not docs:
             return [], []
         
-        # Extract columns from first document
-        columns = [
-            QueryColumn(name=key, type=self._infer_type_from_value(value))
-            for key, value in docs[0].items()
-        ]
-        
-        # Convert documents to rows
-        rows = []
-        for doc in docs:
-            row = []
-            for col in columns:
-                value = doc.get(col.name)
-                if hasattr(value, '__str__') and type(value).__name__ == 'ObjectId':
-                    value = str(value)
-                row.append(value)
-            rows.append(row)
+        return self._docs_to_rows(docs)
+    
+    async def get_table_count(self, table_name: str) -> int:
+        """Get the document count of a collection from its metadata."""
+        if self._db is None:
+            await self.connect()
         
-        return columns, rows
+        return await self._db[table_name].estimated_document_count()
+
+
+def close_clients() -> None:
+    """Close all shared MongoDB clients. Call once at application shutdown."""
+    for client in _clients.values():
+        client.close()
+    _clients.clear()
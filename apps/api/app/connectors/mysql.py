@@ -1,4 +1,6 @@
 import asyncio
+import math
+import random
 import time
 from typing import Any, Dict, List, Optional, Tuple
 import logging
@@ -15,35 +17,75 @@ from app.connectors.base import SQLConnector
 
 logger = logging.getLogger(__name__)
 
+# Columns of a single table, with foreign key references
+_COLUMNS_QUERY = """
+    (SELECT 
+        c.TABLE_NAME as table_name,
+        c.ORDINAL_POSITION as ordinal_position,
+        c.COLUMN_NAME as column_name,
+        c.DATA_TYPE as data_type,
+        c.IS_NULLABLE as is_nullable,
+        c.COLUMN_DEFAULT as column_default,
+        c.COLUMN_KEY as column_key,
+        c.COLUMN_COMMENT as column_comment,
+        kcu.REFERENCED_TABLE_NAME as foreign_table,
+        kcu.REFERENCED_COLUMN_NAME as foreign_column
+    FROM information_schema.COLUMNS c
+    LEFT JOIN information_schema.KEY_COLUMN_USAGE kcu
+        ON c.TABLE_SCHEMA = kcu.TABLE_SCHEMA
+        AND c.TABLE_NAME = kcu.TABLE_NAME
+        AND c.COLUMN_NAME = kcu.COLUMN_NAME
+        AND kcu.REFERENCED_TABLE_NAME IS NOT NULL
+    WHERE c.TABLE_SCHEMA = %s
+    AND c.TABLE_NAME = %s)
+"""
+
+# Max tables per UNION ALL columns query in get_schema
+_COLUMNS_BATCH_SIZE = 50
+
+# Random primary key seeks merged into one random sample
+_SAMPLE_SEEKS = 10
+
+# Rows read per round trip from a server-side cursor
+_FETCH_BATCH_SIZE = 1000
+
+_INTEGER_TYPES = frozenset(('tinyint', 'smallint', 'mediumint', 'int', 'bigint'))
+
 
 class MySQLConnector(SQLConnector):
     """Connector for MySQL databases."""
     
+    IDENTIFIER_QUOTE = "`"
+    
     def __init__(self, config: ConnectionConfig):
         super().__init__(config)
         self._pool: Optional[aiomysql.Pool] = None
+        # Pooled connectors are shared, so concurrent first requests must connect only once
+        self._connect_lock = asyncio.Lock()
     
     async def connect(self) -> bool:
         """Establish connection pool to MySQL."""
         try:
+            min_size, max_size = self._pool_sizes()
             self._pool = await aiomysql.create_pool(
                 host=self.config.host or "localhost",
                 port=self.config.port or 3306,
                 user=self.config.username or "root",
                 password=self.config.password or "",
                 db=self.config.database or "mysql",
-                minsize=1,
-                maxsize=10,
+                minsize=min_size,
+                maxsize=max_size,
                 autocommit=True,
             )
             logger.info("MySQL connection pool created")
             return True
         except Exception as e:
-            logger.error(f"Failed to connect to MySQL: {e}")
+            logger.error("Failed to connect to MySQL: %s", e)
             raise
     
     async def disconnect(self) -> None:
         """Close the connection pool."""
+        self.invalidate_schema()
         if self._pool:
             self._pool.close()
             await self._pool.wait_closed()
@@ -77,10 +119,25 @@ class MySQLConnector(SQLConnector):
         except Exception as e:
             return False, str(e)
     
+    async def ping(self) -> bool:
+        """Check that the pool can still reach MySQL."""
+        if not self._pool:
+            return True
+        async with self._pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("SELECT 1")
+        return True
+    
     async def get_schema(self) -> DatabaseSchema:
         """Get the complete schema of the MySQL database."""
+        cached = self._get_cached_schema()
+        if cached is not None:
+            return cached
+        
         if not self._pool:
-            await self.connect()
+            async with self._connect_lock:
+                if not self._pool:
+                    await self.connect()
         
         async with self._pool.acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
@@ -97,28 +154,21 @@ class MySQLConnector(SQLConnector):
                 """, (self.config.database,))
                 tables = await cursor.fetchall()
                 
-                # Get all columns
-                await cursor.execute("""
-                    SELECT 
-                        c.TABLE_NAME as table_name,
-                        c.COLUMN_NAME as column_name,
-                        c.DATA_TYPE as data_type,
-                        c.IS_NULLABLE as is_nullable,
-                        c.COLUMN_DEFAULT as column_default,
-                        c.COLUMN_KEY as column_key,
-                        c.COLUMN_COMMENT as column_comment,
-                        kcu.REFERENCED_TABLE_NAME as foreign_table,
-                        kcu.REFERENCED_COLUMN_NAME as foreign_column
-                    FROM information_schema.COLUMNS c
-                    LEFT JOIN information_schema.KEY_COLUMN_USAGE kcu
-                        ON c.TABLE_SCHEMA = kcu.TABLE_SCHEMA
-                        AND c.TABLE_NAME = kcu.TABLE_NAME
-                        AND c.COLUMN_NAME = kcu.COLUMN_NAME
-                        AND kcu.REFERENCED_TABLE_NAME IS NOT NULL
-                    WHERE c.TABLE_SCHEMA = %s
-                    ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
-                """, (self.config.database,))
-                columns = await cursor.fetchall()
+                # Get columns one batch of tables at a time; filtering every UNION branch
+                # on both TABLE_SCHEMA and TABLE_NAME lets MySQL open only those tables
+                # instead of scanning the metadata of the whole schema
+                columns = []
+                for i in range(0, len(tables), _COLUMNS_BATCH_SIZE):
+                    batch = tables[i:i + _COLUMNS_BATCH_SIZE]
+                    params: List[Any] = []
+                    for table in batch:
+                        params.extend((self.config.database, table['table_name']))
+                    await cursor.execute(
+                        " UNION ALL ".join([_COLUMNS_QUERY] * len(batch))
+                        + " ORDER BY table_name, ordinal_position",
+                        params,
+                    )
+                    columns.extend(await cursor.fetchall())
         
         # Build table schemas
         table_columns: Dict[str, List[ColumnSchema]] = {}
@@ -155,62 +205,157 @@ class MySQLConnector(SQLConnector):
                 )
             )
         
-        return DatabaseSchema(tables=table_schemas)
+        return self._cache_schema(DatabaseSchema(tables=table_schemas))
+    
+    async def _fetch_rows(
+        self, cursor: aiomysql.SSCursor, query: str, limit: int
+    ) -> List[Tuple[Any, ...]]:
+        """Execute a query and read at most `limit` rows from the cursor in batches."""
+        await cursor.execute(query)
+        rows: List[Tuple[Any, ...]] = []
+        while len(rows) < limit:
+            batch = await cursor.fetchmany(min(_FETCH_BATCH_SIZE, limit - len(rows)))
+            if not batch:
+                break
+            rows.extend(batch)
+        return rows
     
     async def execute_query(
         self, query: str, limit: int = 100, timeout: int = 30
     ) -> Tuple[List[QueryColumn], List[List[Any]], int]:
         """Execute a SQL query on MySQL."""
         if not self._pool:
-            await self.connect()
+            async with self._connect_lock:
+                if not self._pool:
+                    await self.connect()
         
         start_time = time.time()
         
         async with self._pool.acquire() as conn:
-            async with conn.cursor(aiomysql.DictCursor) as cursor:
-                try:
-                    # Add limit if not present
-                    query_lower = query.lower().strip()
-                    if 'limit' not in query_lower and query_lower.startswith('select'):
-                        query = f"{query.rstrip(';')} LIMIT {limit}"
-                    
-                    # Execute with timeout
-                    await asyncio.wait_for(
-                        cursor.execute(query),
-                        timeout=timeout,
-                    )
-                    result = await cursor.fetchall()
-                    
-                    execution_time_ms = int((time.time() - start_time) * 1000)
-                    
-                    if not result:
-                        return [], [], execution_time_ms
-                    
-                    # Extract columns from first row
-                    columns = [
-                        QueryColumn(name=key, type=self._map_sql_type(str(type(value).__name__)))
-                        for key, value in result[0].items()
-                    ]
-                    
-                    # Convert rows to lists
-                    rows = [[value for value in record.values()] for record in result]
-                    
-                    return columns, rows, execution_time_ms
-                    
-                except asyncio.TimeoutError:
-                    raise TimeoutError(f"Query timed out after {timeout} seconds")
-                except Exception as e:
-                    logger.error(f"Query execution failed: {e}")
-                    raise
+            # Unbuffered tuple rows streamed from the server; column names come from the
+            # cursor description
+            cursor = await conn.cursor(aiomysql.SSCursor)
+            exhausted = False
+            try:
+                # Add limit if not present
+                query = self._add_limit(query, limit)
+                
+                # Execute with timeout; one row past the limit shows whether more remain
+                result = await asyncio.wait_for(
+                    self._fetch_rows(cursor, query, limit + 1),
+                    timeout=timeout,
+                )
+                exhausted = len(result) <= limit
+                del result[limit:]
+                
+                execution_time_ms = int((time.time() - start_time) * 1000)
+                
+                if not result:
+                    return [], [], execution_time_ms
+                
+                # Extract columns from the description and first row
+                columns = [
+                    QueryColumn(name=description[0], type=self._map_sql_type(str(type(value).__name__)))
+                    for description, value in zip(cursor.description, result[0])
+                ]
+                
+                # Convert rows to lists
+                rows = [list(record) for record in result]
+                
+                return columns, rows, execution_time_ms
+            
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Query timed out after {timeout} seconds")
+            except Exception as e:
+                logger.error("Query execution failed: %s", e)
+                raise
+            finally:
+                if exhausted:
+                    await cursor.close()
+                else:
+                    # Closing an unbuffered cursor reads every remaining row off the socket,
+                    # and a cancelled read leaves the protocol mid-packet, so the connection
+                    # is dropped from the pool instead
+                    conn.close()
     
     async def get_sample_data(
         self, table_name: str, sample_size: int = 100, random_sample: bool = True
     ) -> Tuple[List[QueryColumn], List[List[Any]]]:
         """Get sample data from MySQL table."""
+        table = self._quote_table(table_name)
         if random_sample:
-            query = f"SELECT * FROM {table_name} ORDER BY RAND() LIMIT {sample_size}"
+            query = await self._primary_key_sample_query(table_name, sample_size)
+            if query is None:
+                # No integer primary key to seek on; sort the whole table randomly
+                query = f"SELECT * FROM {table} ORDER BY RAND() LIMIT {sample_size}"
         else:
-            query = f"SELECT * FROM {table_name} LIMIT {sample_size}"
+            query = f"SELECT * FROM {table} LIMIT {sample_size}"
         
         columns, rows, _ = await self.execute_query(query, limit=sample_size)
         return columns, rows
+    
+    async def _primary_key_sample_query(self, table_name: str, sample_size: int) -> Optional[str]:
+        """
+        Build a random sample query from index seeks at random points of an integer
+        primary key, or return None if the table has no single integer primary key.
+        """
+        if sample_size <= 0:
+            return None
+        
+        if not self._pool:
+            async with self._connect_lock:
+                if not self._pool:
+                    await self.connect()
+        
+        async with self._pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("""
+                    SELECT COLUMN_NAME, DATA_TYPE
+                    FROM information_schema.COLUMNS
+                    WHERE TABLE_SCHEMA = %s
+                    AND TABLE_NAME = %s
+                    AND COLUMN_KEY = 'PRI'
+                """, (self.config.database, table_name))
+                primary_key = await cursor.fetchall()
+                if len(primary_key) != 1 or primary_key[0][1].lower() not in _INTEGER_TYPES:
+                    return None
+                
+                table = self._quote_table(table_name)
+                pk = self._quote_identifier(primary_key[0][0])
+                # MIN/MAX on the primary key are read from the ends of the index
+                await cursor.execute(f"SELECT MIN({pk}), MAX({pk}) FROM {table}")
+                low, high = await cursor.fetchone()
+        
+        if low is None:
+            return None
+        
+        seeks = min(_SAMPLE_SEEKS, sample_size)
+        rows_per_seek = math.ceil(sample_size / seeks)
+        branches = [
+            f"(SELECT * FROM {table} WHERE {pk} >= {random.randint(low, high)} "
+            f"ORDER BY {pk} LIMIT {rows_per_seek})"
+            for _ in range(seeks)
+        ]
+        return " UNION ".join(branches) + f" LIMIT {sample_size}"
+    
+    async def get_table_count(self, table_name: str) -> int:
+        """Get the row count of a table from table statistics, without a full scan."""
+        if not self._pool:
+            async with self._connect_lock:
+                if not self._pool:
+                    await self.connect()
+        
+        async with self._pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("""
+                    SELECT TABLE_ROWS
+                    FROM information_schema.TABLES
+                    WHERE TABLE_SCHEMA = %s
+                    AND TABLE_NAME = %s
+                """, (self.config.database, table_name))
+                row = await cursor.fetchone()
+        
+        # TABLE_ROWS is NULL for views and an InnoDB estimate otherwise
+        if not row or row[0] is None:
+            return await super().get_table_count(table_name)
+        return row[0]
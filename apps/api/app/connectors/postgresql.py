@@ -1,4 +1,5 @@
 import asyncio
+import re
 import time
 from typing import Any, Dict, List, Optional, Tuple
 import logging
@@ -15,6 +16,15 @@ from app.connectors.base import SQLConnector
 
 logger = logging.getLogger(__name__)
 
+# Prepared statements kept per pooled connection; asyncpg reuses them for repeated queries
+_STATEMENT_CACHE_SIZE = 1024
+
+# Rows fetched per round trip when streaming results through a cursor
+_FETCH_CHUNK_SIZE = 1000
+
+# Queries that return rows and can therefore run through a cursor
+_ROW_QUERY_RE = re.compile(r"^\s*(?:select|with)\b", re.IGNORECASE)
+
 
 class PostgreSQLConnector(SQLConnector):
     """Connector for PostgreSQL databases."""
@@ -22,11 +32,18 @@ class PostgreSQLConnector(SQLConnector):
     def __init__(self, config: ConnectionConfig):
         super().__init__(config)
         self._pool: Optional[asyncpg.Pool] = None
+        # Pooled connectors are shared, so concurrent first requests must connect only once
+        self._connect_lock = asyncio.Lock()
+        self._connection_string: Optional[str] = None
     
     def _build_connection_string(self) -> str:
         """Build the connection string from config."""
+        if self._connection_string is not None:
+            return self._connection_string
+        
         if self.config.connection_string:
-            return self.config.connection_string
+            self._connection_string = self.config.connection_string
+            return self._connection_string
         
         user = self.config.username or "postgres"
         password = self.config.password or ""
@@ -35,27 +52,33 @@ class PostgreSQLConnector(SQLConnector):
         database = self.config.database or "postgres"
         
         if password:
-            return f"postgresql://{user}:{password}@{host}:{port}/{database}"
-        return f"postgresql://{user}@{host}:{port}/{database}"
+            self._connection_string = f"postgresql://{user}:{password}@{host}:{port}/{database}"
+        else:
+            self._connection_string = f"postgresql://{user}@{host}:{port}/{database}"
+        return self._connection_string
     
     async def connect(self) -> bool:
         """Establish connection pool to PostgreSQL."""
         try:
             dsn = self._build_connection_string()
+            min_size, max_size = self._pool_sizes()
             self._pool = await asyncpg.create_pool(
                 dsn,
-                min_size=1,
-                max_size=10,
+                min_size=min_size,
+                max_size=max_size,
                 ssl=self.config.ssl if self.config.ssl else None,
+                statement_cache_size=_STATEMENT_CACHE_SIZE,
+                max_cached_statement_lifetime=0,
             )
             logger.info("PostgreSQL connection pool created")
             return True
         except Exception as e:
-            logger.error(f"Failed to connect to PostgreSQL: {e}")
+            logger.error("Failed to connect to PostgreSQL: %s", e)
             raise
     
     async def disconnect(self) -> None:
         """Close the connection pool."""
+        self.invalidate_schema()
         if self._pool:
             await self._pool.close()
             self._pool = None
@@ -82,65 +105,90 @@ class PostgreSQLConnector(SQLConnector):
         except Exception as e:
             return False, str(e)
     
+    async def ping(self) -> bool:
+        """Check that the pool can still reach PostgreSQL."""
+        if not self._pool:
+            return True
+        async with self._pool.acquire(timeout=10) as conn:
+            await conn.fetchval("SELECT 1")
+        return True
+    
     async def get_schema(self) -> DatabaseSchema:
         """Get the complete schema of the PostgreSQL database."""
+        cached = self._get_cached_schema()
+        if cached is not None:
+            return cached
+        
         if not self._pool:
-            await self.connect()
+            async with self._connect_lock:
+                if not self._pool:
+                    await self.connect()
         
         async with self._pool.acquire() as conn:
-            # Get all tables
+            # Get all tables, with row count estimates from the planner statistics
+            # (reltuples is -1 until the table is first vacuumed or analyzed)
             tables_query = """
                 SELECT 
                     t.table_name,
-                    obj_description(
-                        (quote_ident(t.table_schema) || '.' || quote_ident(t.table_name))::regclass
-                    ) as table_comment
+                    obj_description(c.oid) as table_comment,
+                    CASE WHEN c.reltuples < 0 THEN NULL ELSE c.reltuples::bigint END as row_count
                 FROM information_schema.tables t
+                JOIN pg_namespace n ON n.nspname = t.table_schema
+                JOIN pg_class c ON c.relname = t.table_name AND c.relnamespace = n.oid
                 WHERE t.table_schema = 'public'
                 AND t.table_type = 'BASE TABLE'
                 ORDER BY t.table_name;
             """
             tables = await conn.fetch(tables_query)
             
-            # Get all columns
+            # Get all columns, with primary and foreign keys resolved from a single pass
+            # over the constraint catalogs
             columns_query = """
+                WITH key_columns AS (
+                    SELECT 
+                        kcu.table_name,
+                        kcu.column_name,
+                        tc.constraint_type,
+                        ccu.table_name as foreign_table_name,
+                        ccu.column_name as foreign_column_name
+                    FROM information_schema.table_constraints tc
+                    JOIN information_schema.key_column_usage kcu
+                        ON tc.constraint_name = kcu.constraint_name
+                        AND tc.constraint_schema = kcu.constraint_schema
+                    LEFT JOIN information_schema.constraint_column_usage ccu
+                        ON tc.constraint_type = 'FOREIGN KEY'
+                        AND tc.constraint_name = ccu.constraint_name
+                        AND tc.constraint_schema = ccu.constraint_schema
+                    WHERE tc.constraint_type IN ('PRIMARY KEY', 'FOREIGN KEY')
+                    AND tc.table_schema = 'public'
+                )
                 SELECT 
                     c.table_name,
                     c.column_name,
                     c.data_type,
                     c.is_nullable,
                     c.column_default,
-                    CASE WHEN pk.column_name IS NOT NULL THEN true ELSE false END as is_primary_key,
-                    fk.foreign_table_name,
-                    fk.foreign_column_name,
+                    coalesce(bool_or(k.constraint_type = 'PRIMARY KEY'), false) as is_primary_key,
+                    (array_agg(k.foreign_table_name ORDER BY k.foreign_table_name, k.foreign_column_name)
+                        FILTER (WHERE k.foreign_table_name IS NOT NULL))[1] as foreign_table_name,
+                    (array_agg(k.foreign_column_name ORDER BY k.foreign_table_name, k.foreign_column_name)
+                        FILTER (WHERE k.foreign_table_name IS NOT NULL))[1] as foreign_column_name,
                     col_description(
                         (quote_ident(c.table_schema) || '.' || quote_ident(c.table_name))::regclass,
                         c.ordinal_position
                     ) as column_comment
                 FROM information_schema.columns c
-                LEFT JOIN (
-                    SELECT kcu.table_name, kcu.column_name
-                    FROM information_schema.table_constraints tc
-                    JOIN information_schema.key_column_usage kcu
-                        ON tc.constraint_name = kcu.constraint_name
-                    WHERE tc.constraint_type = 'PRIMARY KEY'
-                    AND tc.table_schema = 'public'
-                ) pk ON c.table_name = pk.table_name AND c.column_name = pk.column_name
-                LEFT JOIN (
-                    SELECT 
-                        kcu.table_name,
-                        kcu.column_name,
-                        ccu.table_name as foreign_table_name,
-                        ccu.column_name as foreign_column_name
-                    FROM information_schema.table_constraints tc
-                    JOIN information_schema.key_column_usage kcu
-                        ON tc.constraint_name = kcu.constraint_name
-                    JOIN information_schema.constraint_column_usage ccu
-                        ON tc.constraint_name = ccu.constraint_name
-                    WHERE tc.constraint_type = 'FOREIGN KEY'
-                    AND tc.table_schema = 'public'
-                ) fk ON c.table_name = fk.table_name AND c.column_name = fk.column_name
+                LEFT JOIN key_columns k
+                    ON c.table_name = k.table_name AND c.column_name = k.column_name
                 WHERE c.table_schema = 'public'
+                GROUP BY 
+                    c.table_schema,
+                    c.table_name,
+                    c.column_name,
+                    c.data_type,
+                    c.is_nullable,
+                    c.column_default,
+                    c.ordinal_position
                 ORDER BY c.table_name, c.ordinal_position;
             """
             columns = await conn.fetch(columns_query)
@@ -168,43 +216,55 @@ class PostgreSQLConnector(SQLConnector):
                     )
                 )
             
-            # Get row counts
-            table_schemas = []
-            for table in tables:
-                table_name = table['table_name']
-                row_count = await conn.fetchval(
-                    f"SELECT COUNT(*) FROM {table_name}"
-                )
-                table_schemas.append(
-                    TableSchema(
-                        name=table_name,
-                        columns=table_columns.get(table_name, []),
-                        row_count=row_count,
-                        description=table['table_comment'],
-                    )
+            table_schemas = [
+                TableSchema(
+                    name=table['table_name'],
+                    columns=table_columns.get(table['table_name'], []),
+                    row_count=table['row_count'],
+                    description=table['table_comment'],
                 )
+                for table in tables
+            ]
             
-            return DatabaseSchema(tables=table_schemas)
+            return self._cache_schema(DatabaseSchema(tables=table_schemas))
+    
+    async def _fetch_records(
+        self, conn: asyncpg.Connection, query: str, limit: int
+    ) -> List[asyncpg.Record]:
+        """Fetch at most `limit` records, streaming row queries through a cursor in chunks."""
+        if not _ROW_QUERY_RE.match(query):
+            return (await conn.fetch(query))[:limit]
+        
+        records: List[asyncpg.Record] = []
+        # Cursors only live inside a transaction; closing it early stops the query server-side
+        async with conn.transaction():
+            cursor = await conn.cursor(query)
+            while len(records) < limit:
+                chunk = await cursor.fetch(min(_FETCH_CHUNK_SIZE, limit - len(records)))
+                if not chunk:
+                    break
+                records.extend(chunk)
+        return records
     
     async def execute_query(
         self, query: str, limit: int = 100, timeout: int = 30
     ) -> Tuple[List[QueryColumn], List[List[Any]], int]:
         """Execute a SQL query on PostgreSQL."""
         if not self._pool:
-            await self.connect()
+            async with self._connect_lock:
+                if not self._pool:
+                    await self.connect()
         
         start_time = time.time()
         
         async with self._pool.acquire() as conn:
             try:
                 # Add limit if not present
-                query_lower = query.lower().strip()
-                if 'limit' not in query_lower and query_lower.startswith('select'):
-                    query = f"{query.rstrip(';')} LIMIT {limit}"
+                query = self._add_limit(query, limit)
                 
                 # Execute with timeout
                 result = await asyncio.wait_for(
-                    conn.fetch(query),
+                    self._fetch_records(conn, query, limit),
                     timeout=timeout,
                 )
                 
@@ -219,30 +279,31 @@ class PostgreSQLConnector(SQLConnector):
                     for key, value in result[0].items()
                 ]
                 
-                # Convert rows to lists
-                rows = [[value for value in record.values()] for record in result]
+                # Records are sequences, so they convert to lists without per-cell lookups
+                rows = [list(record) for record in result]
                 
                 return columns, rows, execution_time_ms
                 
             except asyncio.TimeoutError:
                 raise TimeoutError(f"Query timed out after {timeout} seconds")
             except Exception as e:
-                logger.error(f"Query execution failed: {e}")
+                logger.error("Query execution failed: %s", e)
                 raise
     
     async def get_sample_data(
         self, table_name: str, sample_size: int = 100, random_sample: bool = True
     ) -> Tuple[List[QueryColumn], List[List[Any]]]:
         """Get sample data using TABLESAMPLE for efficiency."""
+        table = self._quote_table(table_name)
         if random_sample:
             # Use TABLESAMPLE for large tables (PostgreSQL specific)
             query = f"""
-                SELECT * FROM {table_name} 
+                SELECT * FROM {table} 
                 TABLESAMPLE BERNOULLI(10) 
                 LIMIT {sample_size}
             """
         else:
-            query = f"SELECT * FROM {table_name} LIMIT {sample_size}"
+            query = f"SELECT * FROM {table} LIMIT {sample_size}"
         
         try:
             columns, rows, _ = await self.execute_query(query, limit=sample_size)
@@ -250,3 +311,21 @@ class PostgreSQLConnector(SQLConnector):
         except Exception:
             # Fallback to regular sample if TABLESAMPLE fails
             return await super().get_sample_data(table_name, sample_size, random_sample)
+    
+    async def get_table_count(self, table_name: str) -> int:
+        """Get the row count of a table from planner statistics, without a full scan."""
+        if not self._pool:
+            async with self._connect_lock:
+                if not self._pool:
+                    await self.connect()
+        
+        async with self._pool.acquire() as conn:
+            estimate = await conn.fetchval(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass($1)",
+                table_name,
+            )
+        
+        # reltuples is -1 (0 before PostgreSQL 14) until the table is first vacuumed or analyzed
+        if estimate is None or estimate <= 0:
+            return await super().get_table_count(table_name)
+        return estimate
@@ -1,7 +1,13 @@
+import asyncio
+from collections import defaultdict
+import heapq
+import random
 import time
 from typing import Any, Dict, List, Optional, Tuple
 import logging
+from operator import itemgetter
 import httpx
+import orjson
 
 from app.models import (
     ConnectionConfig,
@@ -14,6 +20,29 @@ from app.connectors.base import BaseConnector
 
 logger = logging.getLogger(__name__)
 
+# Max page requests in flight when fetching a paginated response
+_PAGE_CONCURRENCY = 8
+
+# Max pages fetched into the cache on connect
+_MAX_PAGES = 100
+
+# Keep-alive limits for the HTTP clients
+_CLIENT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# Client shared by connectors that have no client of their own (e.g. for test_connection)
+_shared_client: Optional[httpx.AsyncClient] = None
+
+# Decoded JSON only produces these exact types, so no isinstance fallback is needed
+_VALUE_TYPES: Dict[type, str] = {
+    type(None): "null",
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    str: "string",
+    list: "array",
+    dict: "object",
+}
+
 
 class RESTAPIConnector(BaseConnector):
     """Connector for REST API data sources."""
@@ -22,60 +51,112 @@ class RESTAPIConnector(BaseConnector):
         super().__init__(config)
         self._client: Optional[httpx.AsyncClient] = None
         self._cached_data: Optional[List[Dict]] = None
+        # Pooled connectors are shared, so concurrent first requests must connect only once
+        self._connect_lock = asyncio.Lock()
+        # Per filter key: positions of records by str(value), and of records without the key
+        self._indexes: Dict[str, Tuple[Dict[str, List[int]], List[int]]] = {}
+    
+    def _build_headers(self) -> Dict[str, str]:
+        """Build request headers from config, without modifying the configured headers."""
+        headers = dict(self.config.headers or {})
+        if self.config.api_key:
+            headers["Authorization"] = f"Bearer {self.config.api_key}"
+        return headers
     
     async def connect(self) -> bool:
         """Initialize the HTTP client."""
         try:
-            headers = self.config.headers or {}
-            if self.config.api_key:
-                headers["Authorization"] = f"Bearer {self.config.api_key}"
-            
             self._client = httpx.AsyncClient(
                 base_url=self.config.api_url,
-                headers=headers,
+                headers=self._build_headers(),
                 timeout=30.0,
+                limits=_CLIENT_LIMITS,
             )
             
             # Test with a simple request
             response = await self._client.get("")
             response.raise_for_status()
             
-            # Cache the initial data
-            data = response.json()
-            if isinstance(data, list):
-                self._cached_data = data
-            elif isinstance(data, dict) and 'data' in data:
-                self._cached_data = data['data'] if isinstance(data['data'], list) else [data['data']]
-            else:
-                self._cached_data = [data]
+            # Cache the initial data, fetching any remaining pages concurrently
+            data = orjson.loads(response.content)
+            self._cached_data = self._extract_records(data) + await self._fetch_remaining_pages(data)
+            self._indexes = {}
             
-            logger.info(f"REST API connection established, fetched {len(self._cached_data)} records")
+            logger.info("REST API connection established, fetched %d records", len(self._cached_data))
             return True
         except Exception as e:
-            logger.error(f"Failed to connect to REST API: {e}")
+            logger.error("Failed to connect to REST API: %s", e)
             raise
     
+    def _extract_records(self, data: Any) -> List[Dict]:
+        """Extract the list of records from an API response body."""
+        # Decoded JSON only produces exact list/dict types, so identity checks suffice
+        data_type = type(data)
+        if data_type is list:
+            return data
+        if data_type is dict and 'data' in data:
+            records = data['data']
+            return records if type(records) is list else [records]
+        return [data]
+    
+    async def _fetch_page(self, page: int, semaphore: asyncio.Semaphore) -> List[Dict]:
+        """Fetch the records of a single page."""
+        async with semaphore:
+            response = await self._client.get("", params={"page": page})
+        response.raise_for_status()
+        return self._extract_records(orjson.loads(response.content))
+    
+    async def _fetch_remaining_pages(self, data: Any) -> List[Dict]:
+        """Fetch the pages after the first one when the response reports `page` and `total_pages`."""
+        if not isinstance(data, dict):
+            return []
+        
+        page = data.get('page', 1)
+        total_pages = data.get('total_pages')
+        if not isinstance(page, int) or not isinstance(total_pages, int) or total_pages <= page:
+            return []
+        
+        if total_pages > _MAX_PAGES:
+            logger.warning(
+                "REST API reports %d pages; only the first %d are fetched", total_pages, _MAX_PAGES
+            )
+        
+        semaphore = asyncio.Semaphore(_PAGE_CONCURRENCY)
+        page_numbers = range(page + 1, min(total_pages, _MAX_PAGES) + 1)
+        # A failed page is skipped rather than failing the whole connection
+        pages = await asyncio.gather(
+            *(self._fetch_page(next_page, semaphore) for next_page in page_numbers),
+            return_exceptions=True,
+        )
+        records: List[Dict] = []
+        for next_page, result in zip(page_numbers, pages):
+            if isinstance(result, BaseException):
+                logger.warning("Failed to fetch REST API page %d: %s", next_page, result)
+            else:
+                records.extend(result)
+        return records
+    
     async def disconnect(self) -> None:
         """Close the HTTP client."""
+        self.invalidate_schema()
         if self._client:
             await self._client.aclose()
             self._client = None
             self._cached_data = None
+            self._indexes = {}
             logger.info("REST API connection closed")
     
     async def test_connection(self) -> Tuple[bool, Optional[str]]:
         """Test the REST API connection."""
         try:
-            headers = self.config.headers or {}
-            if self.config.api_key:
-                headers["Authorization"] = f"Bearer {self.config.api_key}"
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    self.config.api_url,
-                    headers=headers,
-                )
-                response.raise_for_status()
+            # Reuse warm connections instead of opening a new client per test
+            client = self._client or _get_shared_client()
+            response = await client.get(
+                self.config.api_url,
+                headers=self._build_headers(),
+                timeout=10.0,
+            )
+            response.raise_for_status()
             
             return True, None
         except httpx.HTTPStatusError as e:
@@ -95,39 +176,29 @@ class RESTAPIConnector(BaseConnector):
     
     def _infer_type_from_value(self, value: Any) -> str:
         """Infer the data type from a value."""
-        if value is None:
-            return "null"
-        elif isinstance(value, bool):
-            return "boolean"
-        elif isinstance(value, int):
-            return "integer"
-        elif isinstance(value, float):
-            return "number"
-        elif isinstance(value, str):
-            return "string"
-        elif isinstance(value, list):
-            return "array"
-        elif isinstance(value, dict):
-            return "object"
-        else:
-            return "string"
+        return _VALUE_TYPES.get(type(value), "string")
     
     async def get_schema(self) -> DatabaseSchema:
         """Infer schema from the API response."""
+        cached = self._get_cached_schema()
+        if cached is not None:
+            return cached
+        
         if self._cached_data is None:
-            await self.connect()
+            async with self._connect_lock:
+                if self._cached_data is None:
+                    await self.connect()
         
         if not self._cached_data:
-            return DatabaseSchema(tables=[])
+            return self._cache_schema(DatabaseSchema(tables=[]))
         
         # Infer columns from the data
-        field_types: Dict[str, set] = {}
+        field_types: Dict[str, set] = defaultdict(set)
+        value_types = _VALUE_TYPES
         for record in self._cached_data[:100]:  # Sample first 100 records
             if isinstance(record, dict):
                 for key, value in record.items():
-                    if key not in field_types:
-                        field_types[key] = set()
-                    field_types[key].add(self._infer_type_from_value(value))
+                    field_types[key].add(value_types.get(type(value), "string"))
         
         columns = []
         for field_name, types in field_types.items():
@@ -150,7 +221,7 @@ class RESTAPIConnector(BaseConnector):
             row_count=len(self._cached_data),
         )
         
-        return DatabaseSchema(tables=[table_schema])
+        return self._cache_schema(DatabaseSchema(tables=[table_schema]))
     
     async def execute_query(
         self, query: str, limit: int = 100, timeout: int = 30
@@ -160,7 +231,9 @@ class RESTAPIConnector(BaseConnector):
         Query format: endpoint?params or JSONPath expression
         """
         if self._client is None:
-            await self.connect()
+            async with self._connect_lock:
+                if self._client is None:
+                    await self.connect()
         
         start_time = time.time()
         
@@ -169,14 +242,7 @@ class RESTAPIConnector(BaseConnector):
             if query.startswith('/') or query.startswith('http'):
                 response = await self._client.get(query)
                 response.raise_for_status()
-                data = response.json()
-                
-                if isinstance(data, list):
-                    records = data[:limit]
-                elif isinstance(data, dict) and 'data' in data:
-                    records = data['data'][:limit] if isinstance(data['data'], list) else [data['data']]
-                else:
-                    records = [data]
+                records = self._extract_records(orjson.loads(response.content))[:limit]
             else:
                 # Use cached data with simple filtering
                 records = self._filter_cached_data(query, limit)
@@ -186,25 +252,37 @@ class RESTAPIConnector(BaseConnector):
             if not records:
                 return [], [], execution_time_ms
             
-            # Extract columns from first record
-            first_record = records[0]
-            columns = [
-                QueryColumn(name=key, type=self._infer_type_from_value(value))
-                for key, value in first_record.items()
-            ]
-            
-            # Convert records to rows
-            rows = []
-            for record in records:
-                row = [record.get(col.name) for col in columns]
-                rows.append(row)
+            columns, rows = self._records_to_rows(records)
             
             return columns, rows, execution_time_ms
             
         except Exception as e:
-            logger.error(f"REST API query failed: {e}")
+            logger.error("REST API query failed: %s", e)
             raise
     
+    def _records_to_rows(
+        self, records: List[Dict[str, Any]]
+    ) -> Tuple[List[QueryColumn], List[List[Any]]]:
+        """Convert records to columns and rows, using the first record as the template."""
+        first_record = records[0]
+        names = list(first_record)
+        columns = [
+            QueryColumn(name=key, type=self._infer_type_from_value(value))
+            for key, value in first_record.items()
+        ]
+        
+        if len(names) <= 1:
+            rows = [[record.get(name) for name in names] for record in records]
+        else:
+            get_fields = itemgetter(*names)
+            try:
+                rows = [list(get_fields(record)) for record in records]
+            except KeyError:
+                # Records missing some fields take the per-field path
+                rows = [[record.get(name) for name in names] for record in records]
+        
+        return columns, rows
+    
     def _filter_cached_data(self, query: str, limit: int) -> List[Dict]:
         """Filter cached data using simple key=value syntax."""
         if not self._cached_data:
@@ -220,49 +298,80 @@ class RESTAPIConnector(BaseConnector):
         if not filters:
             return self._cached_data[:limit]
         
-        filtered = []
-        for record in self._cached_data:
-            if isinstance(record, dict):
-                match = True
-                for key, value in filters.items():
-                    if key in record and str(record[key]) != value:
-                        match = False
-                        break
-                if match:
-                    filtered.append(record)
-                    if len(filtered) >= limit:
-                        break
+        # A record matches when each filtered key is missing or equal as a string
+        matches: Optional[set] = None
+        for key, value in filters.items():
+            positions, missing = self._get_index(key)
+            candidates = set(positions.get(value, ()))
+            candidates.update(missing)
+            matches = candidates if matches is None else matches & candidates
+            if not matches:
+                return []
         
-        return filtered
+        return [self._cached_data[i] for i in heapq.nsmallest(limit, matches)]
+    
+    def _get_index(self, key: str) -> Tuple[Dict[str, List[int]], List[int]]:
+        """Get the index of cached records for a filter key, building it on first use."""
+        index = self._indexes.get(key)
+        if index is None:
+            positions: Dict[str, List[int]] = {}
+            missing: List[int] = []
+            for i, record in enumerate(self._cached_data):
+                if not isinstance(record, dict):
+                    continue
+                if key in record:
+                    positions.setdefault(str(record[key]), []).append(i)
+                else:
+                    missing.append(i)
+            index = self._indexes[key] = (positions, missing)
+        return index
     
     async def get_sample_data(
         self, table_name: str, sample_size: int = 100, random_sample: bool = True
     ) -> Tuple[List[QueryColumn], List[List[Any]]]:
         """Get sample data from the cached API response."""
         if self._cached_data is None:
-            await self.connect()
+            async with self._connect_lock:
+                if self._cached_data is None:
+                    await self.connect()
         
         if not self._cached_data:
             return [], []
         
-        import random
-        
         if random_sample and len(self._cached_data) > sample_size:
-            samples = random.sample(self._cached_data, sample_size)
+            # Draw positions rather than records and visit them in order, so the
+            # sample keeps the API's record order
+            positions = sorted(random.sample(range(len(self._cached_data)), sample_size))
+            samples = [self._cached_data[i] for i in positions]
         else:
             samples = self._cached_data[:sample_size]
         
         if not samples:
             return [], []
         
-        columns = [
-            QueryColumn(name=key, type=self._infer_type_from_value(value))
-            for key, value in samples[0].items()
-        ]
-        
-        rows = []
-        for record in samples:
-            row = [record.get(col.name) for col in columns]
-            rows.append(row)
+        return self._records_to_rows(samples)
+    
+    async def get_table_count(self, table_name: str) -> int:
+        """Get the number of cached records."""
+        if self._cached_data is None:
+            async with self._connect_lock:
+                if self._cached_data is None:
+                    await self.connect()
         
-        return columns, rows
+        return len(self._cached_data)
+
+
+def _get_shared_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(timeout=30.0, limits=_CLIENT_LIMITS)
+    return _shared_client
+
+
+async def close_clients() -> None:
+    """Close the shared HTTP client. Call once at application shutdown."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
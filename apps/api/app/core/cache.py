@@ -0,0 +1,56 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+# Quoted literals are kept verbatim; everything else is split on whitespace
+_QUERY_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\S+")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace outside quoted literals so equivalent queries share a cache key."""
+    return " ".join(_QUERY_TOKEN_RE.findall(query))
+
+
+class LRUCache:
+    """In-process LRU cache with an optional per-entry TTL."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries beyond `maxsize`."""
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove a single entry, if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,6 +1,6 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
-from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import cached_property
+from typing import Optional, Tuple
 
 
 class Settings(BaseSettings):
@@ -22,6 +22,24 @@ class Settings(BaseSettings):
     # Redis settings
     redis_url: Optional[str] = "redis://localhost:6379"
     
+    # Query result and schema cache settings
+    query_cache_size: int = 128  # Max cached results per connector type, 0 disables
+    query_cache_ttl: int = 60  # Seconds before results from mutable sources expire
+    schema_cache_ttl: int = 60  # Seconds a connector reuses its introspected schema, 0 disables
+    
+    # Data source connector pool
+    connector_pool_size: int = 64  # Least recently used connectors beyond this are closed
+    connector_idle_ttl: int = 900  # Seconds an unused connector is kept open
+    connector_check_interval: int = 60  # Seconds between idle and liveness checks, 0 disables
+    
+    # LLM completion cache, used for low-temperature prompts only
+    llm_cache_size: int = 1000  # Max cached completions, 0 disables
+    llm_cache_ttl: int = 3600  # Seconds before a cached completion expires
+    
+    # In-memory chat history limits
+    chat_max_conversations: int = 1000  # Least recently used conversations beyond this are dropped
+    chat_max_messages: int = 100  # Oldest messages beyond this are dropped from a conversation
+    
     # OpenAI settings
     openai_api_key: Optional[str] = None
     openai_model: str = "gpt-4o-mini"
@@ -50,22 +68,29 @@ class Settings(BaseSettings):
     jwt_access_token_expire_minutes: int = 30
     
     # CORS settings
-    cors_origins: str = "http://localhost:3000,http://localhost:3001"
+    cors_origins: str = "http://localhost:3000,http://localhost:3001"  # Comma-separated
     
     # Rate limiting
     rate_limit_requests: int = 100
     rate_limit_window: int = 60
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    # Read-only after startup; frozen settings are hashable and reject accidental writes
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        frozen=True,
+    )
+    
+    @cached_property
+    def cors_origin_list(self) -> Tuple[str, ...]:
+        """The configured CORS origins, parsed once."""
+        return tuple(origin.strip() for origin in self.cors_origins.split(",") if origin.strip())
 
 
-@lru_cache()
-def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+settings = Settings()
 
 
-settings = get_settings()
+def get_settings() -> Settings:
+    """Get the settings instance."""
+    return settings
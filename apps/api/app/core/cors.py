@@ -0,0 +1,99 @@
+from typing import Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Methods allowed by a "*" method list, as in Starlette's CORSMiddleware
+_ALLOWED_METHODS = frozenset(("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"))
+
+# Response headers that do not depend on the request, encoded once
+_VARY_ORIGIN = (b"vary", b"Origin")
+_ALLOW_CREDENTIALS = (b"access-control-allow-credentials", b"true")
+_PREFLIGHT_HEADERS = (
+    (b"vary", b"Origin, Access-Control-Request-Method, Access-Control-Request-Headers"),
+    (b"access-control-allow-methods", ", ".join(sorted(_ALLOWED_METHODS)).encode()),
+    (b"access-control-max-age", b"600"),
+    _ALLOW_CREDENTIALS,
+    (b"content-type", b"text/plain; charset=utf-8"),
+)
+
+
+class FastCORSMiddleware:
+    """
+    CORS middleware for a fixed origin list that allows credentials and all methods and headers.
+    A "*" in the list allows every origin. Header values are built once at startup and
+    requests are matched on their raw headers.
+    """
+    
+    def __init__(self, app: ASGIApp, allow_origins: Iterable[str]):
+        self.app = app
+        self._allow_origins = frozenset(allow_origins)
+        # Credentials cannot be used with a literal "*", so allowed origins are echoed back
+        self._allow_all_origins = "*" in self._allow_origins
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        origin: Optional[bytes] = None
+        request_method: Optional[bytes] = None
+        request_headers: Optional[bytes] = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+        
+        allowed = self._allow_all_origins or origin.decode("latin-1") in self._allow_origins
+        
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(send, origin, allowed, request_method, request_headers)
+            return
+        
+        extra_headers: List[Tuple[bytes, bytes]] = [_VARY_ORIGIN, _ALLOW_CREDENTIALS]
+        if allowed:
+            extra_headers.append((b"access-control-allow-origin", origin))
+        
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *extra_headers]
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
+    
+    async def _preflight(
+        self,
+        send: Send,
+        origin: bytes,
+        allowed: bool,
+        request_method: bytes,
+        request_headers: Optional[bytes],
+    ) -> None:
+        """Answer a preflight request without calling the application."""
+        headers = list(_PREFLIGHT_HEADERS)
+        failures = []
+        if allowed:
+            headers.append((b"access-control-allow-origin", origin))
+        else:
+            failures.append("origin")
+        if request_method.decode("latin-1") not in _ALLOWED_METHODS:
+            failures.append("method")
+        if request_headers is not None:
+            # All headers are allowed, so the requested ones are mirrored back
+            headers.append((b"access-control-allow-headers", request_headers))
+        
+        body = ("Disallowed CORS " + ", ".join(failures)).encode() if failures else b"OK"
+        headers.append((b"content-length", str(len(body)).encode()))
+        
+        await send({
+            "type": "http.response.start",
+            "status": 400 if failures else 200,
+            "headers": headers,
+        })
+        await send({"type": "http.response.body", "body": body})
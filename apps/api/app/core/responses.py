@@ -0,0 +1,20 @@
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson.
+    Values orjson cannot encode natively (e.g. Decimal) fall back to FastAPI's
+    jsonable_encoder, so output matches the default response class.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=jsonable_encoder,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
@@ -1,10 +1,15 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, Response
 from datetime import datetime
 import logging
+import time
+import orjson
 
 from app.core.config import settings
+from app.core.cors import FastCORSMiddleware
+from app.core.responses import ORJSONResponse
+from app.connectors import close_connectors, start_pool_maintenance
+from app.services import slack_service, teams_service
 from app.models import HealthCheck
 from app.routers import (
     datasources_router,
@@ -13,20 +18,67 @@ from app.routers import (
     integrations_router,
 )
 
+
+class _LogFormatter(logging.Formatter):
+    """Log formatter that formats the timestamp's date and time once per second."""
+    
+    _cached_time = (None, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt=None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = time.strftime(self.default_time_format, self.converter(record.created))
+            # Stored as one tuple so logging threads never see a mismatched pair
+            self._cached_time = (second, formatted)
+        return self.default_msec_format % (formatted, record.msecs)
+
+
 # Configure logging
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(_LogFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
 logging.basicConfig(
     level=logging.DEBUG if settings.debug else logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[_log_handler],
 )
 logger = logging.getLogger(__name__)
 
+# The health body only varies by timestamp, so the rest is serialized once
+_HEALTH_PREFIX = (
+    b'{"status":"healthy","version":' + orjson.dumps(settings.app_version) + b',"timestamp":"'
+)
+_HEALTH_SUFFIX = b'"}'
+
+# Static endpoint bodies, serialized once
+_ROOT_BODY = orjson.dumps({
+    "name": settings.app_name,
+    "version": settings.app_version,
+    "docs": "/docs",
+    "health": "/health",
+})
+_API_INFO_BODY = orjson.dumps({
+    "version": "v1",
+    "endpoints": {
+        "datasources": "/api/v1/datasources",
+        "insights": "/api/v1/insights",
+        "chat": "/api/v1/chat",
+        "integrations": "/api/v1/integrations",
+    },
+})
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    logger.info(f"Starting {settings.app_name} v{settings.app_version}")
+    logger.info("Starting %s v%s", settings.app_name, settings.app_version)
+    start_pool_maintenance()
     yield
-    logger.info(f"Shutting down {settings.app_name}")
+    logger.info("Shutting down %s", settings.app_name)
+    await close_connectors()
+    await slack_service.close_clients()
+    await teams_service.close_clients()
 
 
 # Create FastAPI application
@@ -47,19 +99,13 @@ app = FastAPI(
     - **Schema Intelligence**: Automatic schema detection and documentation
     """,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
 # Configure CORS
-cors_origins = [origin.strip() for origin in settings.cors_origins.split(",")]
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(FastCORSMiddleware, allow_origins=settings.cors_origin_list)
 
 # Include routers
 app.include_router(datasources_router, prefix="/api/v1")
@@ -71,36 +117,22 @@ app.include_router(integrations_router, prefix="/api/v1")
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with API information."""
-    return {
-        "name": settings.app_name,
-        "version": settings.app_version,
-        "docs": "/docs",
-        "health": "/health",
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health", response_model=HealthCheck, tags=["Health"])
 async def health_check():
     """Health check endpoint."""
-    return HealthCheck(
-        status="healthy",
-        version=settings.app_version,
-        timestamp=datetime.utcnow(),
+    return Response(
+        content=_HEALTH_PREFIX + datetime.utcnow().isoformat().encode() + _HEALTH_SUFFIX,
+        media_type="application/json",
     )
 
 
 @app.get("/api/v1", tags=["API"])
 async def api_info():
     """API version information."""
-    return {
-        "version": "v1",
-        "endpoints": {
-            "datasources": "/api/v1/datasources",
-            "insights": "/api/v1/insights",
-            "chat": "/api/v1/chat",
-            "integrations": "/api/v1/integrations",
-        },
-    }
+    return Response(content=_API_INFO_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
@@ -51,7 +52,10 @@ class InsightSeverity(str, Enum):
 
 
 # Data Source Models
-class ColumnSchema(BaseModel):
+# Built by connectors in bulk from typed metadata, so plain slotted dataclasses
+# are used instead of validating models; pydantic still serializes them as fields
+@dataclass(slots=True, frozen=True)
+class ColumnSchema:
     """Schema for a database column."""
     name: str
     type: str
@@ -85,6 +89,8 @@ class ConnectionConfig(BaseModel):
     password: Optional[str] = None
     ssl: bool = False
     connection_string: Optional[str] = None
+    min_pool_size: Optional[int] = Field(default=None, ge=0)
+    max_pool_size: Optional[int] = Field(default=None, ge=1)
     
     # For file-based sources
     file_path: Optional[str] = None
@@ -132,8 +138,7 @@ class DataSourceResponse(DataSourceBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Query Models
@@ -150,7 +155,8 @@ class NLQueryRequest(BaseModel):
     include_explanation: bool = True
 
 
-class QueryColumn(BaseModel):
+@dataclass(slots=True, frozen=True)
+class QueryColumn:
     """Column metadata in query results."""
     name: str
     type: str
@@ -226,8 +232,7 @@ class InsightResponse(InsightBase):
     created_at: datetime
     acknowledged: bool = False
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class GenerateInsightsRequest(BaseModel):
@@ -273,8 +278,7 @@ class IntegrationResponse(IntegrationBase):
     last_message_at: Optional[datetime] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Sample Data Models
@@ -1,8 +1,14 @@
 # Routers module
-from app.routers.datasources import router as datasources_router
-from app.routers.insights import router as insights_router
-from app.routers.chat import router as chat_router
-from app.routers.integrations import router as integrations_router
+from importlib import import_module
+
+# Router modules are imported on first access, so importing one router
+# does not pull in the others and their services
+_ROUTER_MODULES = {
+    "datasources_router": "app.routers.datasources",
+    "insights_router": "app.routers.insights",
+    "chat_router": "app.routers.chat",
+    "integrations_router": "app.routers.integrations",
+}
 
 __all__ = [
     "datasources_router",
@@ -10,3 +16,13 @@ __all__ = [
     "chat_router",
     "integrations_router",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _ROUTER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    router = import_module(module_name).router
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = router
+    return router
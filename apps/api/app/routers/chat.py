@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 from typing import List, Optional
 
 from app.models import (
@@ -19,7 +19,9 @@ async def send_message(
     """Send a message to the AI assistant."""
     try:
         service = get_chat_service()
-        return await service.send_message(request)
+        result = await service.send_message(request)
+        # Returning the serialized response skips re-validating the built result
+        return Response(content=result.model_dump_json(), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
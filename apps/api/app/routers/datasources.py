@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Response, status, Depends
 from typing import List, Optional
+from pydantic import TypeAdapter
 
 from app.models import (
     DataSourceCreate,
@@ -17,6 +18,9 @@ from app.core.security import get_current_user
 
 router = APIRouter(prefix="/datasources", tags=["Data Sources"])
 
+# Serializes data source lists to JSON in one pass, without re-validating each item
+_DATA_SOURCE_LIST_ADAPTER = TypeAdapter(List[DataSourceResponse])
+
 
 @router.post("", response_model=DataSourceResponse, status_code=status.HTTP_201_CREATED)
 async def create_data_source(
@@ -39,7 +43,8 @@ async def list_data_sources(
 ):
     """List all data sources."""
     service = get_data_source_service()
-    return await service.list_data_sources()
+    sources = await service.list_data_sources()
+    return Response(content=_DATA_SOURCE_LIST_ADAPTER.dump_json(sources), media_type="application/json")
 
 
 @router.get("/{source_id}", response_model=DataSourceResponse)
@@ -117,12 +122,14 @@ async def execute_query(
     """Execute a SQL query on a data source."""
     try:
         service = get_data_source_service()
-        return await service.execute_query(
+        result = await service.execute_query(
             source_id,
             request.query,
             request.limit,
             request.timeout,
         )
+        # Rows can be large; serialize the built result once instead of re-validating it
+        return Response(content=result.model_dump_json(), media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except TimeoutError as e:
@@ -140,7 +147,8 @@ async def execute_nl_query(
     """Execute a natural language query."""
     try:
         service = get_data_source_service()
-        return await service.execute_nl_query(source_id, request.question)
+        result = await service.execute_nl_query(source_id, request.question)
+        return Response(content=result.model_dump_json(), media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -156,12 +164,13 @@ async def get_sample_data(
     """Get sample data from a table."""
     try:
         service = get_data_source_service()
-        return await service.get_sample_data(
+        result = await service.get_sample_data(
             source_id,
             request.table_name,
             request.sample_size,
             request.random_sample,
         )
+        return Response(content=result.model_dump_json(), media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
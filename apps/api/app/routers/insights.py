@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
+from pydantic import TypeAdapter
 from typing import List, Optional
 
 from app.models import (
@@ -11,6 +12,9 @@ from app.services import get_insight_service
 
 router = APIRouter(prefix="/insights", tags=["Insights"])
 
+# Serializes insight lists to JSON in one pass, without re-validating each item
+_INSIGHT_LIST_ADAPTER = TypeAdapter(List[InsightResponse])
+
 
 @router.post("/generate", response_model=List[InsightResponse])
 async def generate_insights(
@@ -36,7 +40,8 @@ async def list_insights(
 ):
     """List insights with optional filters."""
     service = get_insight_service()
-    return await service.list_insights(data_source_id, insight_type, severity)
+    insights = await service.list_insights(data_source_id, insight_type, severity)
+    return Response(content=_INSIGHT_LIST_ADAPTER.dump_json(insights), media_type="application/json")
 
 
 @router.get("/{insight_id}", response_model=InsightResponse)
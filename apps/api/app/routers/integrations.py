@@ -1,5 +1,7 @@
-from fastapi import APIRouter, HTTPException, status, Request
+import asyncio
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Request
 from typing import List, Optional
+import orjson
 
 from app.models import (
     IntegrationType,
@@ -78,19 +80,17 @@ async def send_slack_message(
 
 
 @router.post("/slack/events")
-async def handle_slack_events(request: Request):
+async def handle_slack_events(request: Request, background_tasks: BackgroundTasks):
     """Handle Slack events webhook."""
-    body = await request.json()
+    body = orjson.loads(await request.body())
     
     # Handle URL verification challenge
     if body.get("type") == "url_verification":
         return {"challenge": body.get("challenge")}
     
-    # Handle events
-    event = body.get("event", {})
-    event_type = event.get("type")
-    
-    # Add event handling logic here
+    # Slack expects an ack within 3 seconds, so events are handled after the response is sent
+    service = get_slack_service()
+    background_tasks.add_task(service.handle_event, body.get("event", {}))
     
     return {"status": "ok"}
 
@@ -199,7 +199,10 @@ async def list_all_integrations(
     slack_service = get_slack_service()
     teams_service = get_teams_service()
     
-    slack_integrations = await slack_service.list_integrations()
-    teams_integrations = await teams_service.list_integrations()
+    # The two services are independent, so list them concurrently
+    slack_integrations, teams_integrations = await asyncio.gather(
+        slack_service.list_integrations(),
+        teams_service.list_integrations(),
+    )
     
     return slack_integrations + teams_integrations
@@ -1,8 +1,10 @@
 import logging
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 import uuid
 
+from app.core.config import settings
 from app.models import (
     ChatMessage,
     ChatRequest,
@@ -14,13 +16,25 @@ from app.services.llm_service import get_llm_service
 
 logger = logging.getLogger(__name__)
 
+# Fallback reply when no data source is selected; shared, so treated as read-only
+_GENERAL_CHAT_RESPONSE: Dict[str, Any] = {
+    "message": "Please select a data source to start analyzing your data. "
+              "Once connected, I can help you explore your data, run queries, "
+              "and generate insights.",
+    "suggestions": (
+        "Connect to a PostgreSQL database",
+        "Upload a CSV file",
+        "Connect to a REST API",
+    ),
+}
+
 
 class ChatService:
     """Service for handling AI-powered data chat."""
     
     def __init__(self):
-        # In-memory storage for conversations
-        self._conversations: Dict[str, List[Dict[str, Any]]] = {}
+        # In-memory storage for conversations, least recently used first
+        self._conversations: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
     
     async def send_message(
         self,
@@ -30,61 +44,67 @@ class ChatService:
         conversation_id = request.conversation_id or str(uuid.uuid4())
         
         # Get or create conversation history
-        if conversation_id not in self._conversations:
-            self._conversations[conversation_id] = []
-        
-        history = self._conversations[conversation_id]
+        history = self._conversations.get(conversation_id)
+        if history is None:
+            history = self._conversations[conversation_id] = []
+            while len(self._conversations) > settings.chat_max_conversations:
+                self._conversations.popitem(last=False)
+        else:
+            self._conversations.move_to_end(conversation_id)
         
-        # Add user message to history
+        # Add user message to history; timestamps are kept as datetimes so replay needs no parsing
         user_message = {
             "role": "user",
             "content": request.message,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
         }
         history.append(user_message)
         
-        # Get data source if specified
+        ds_service = get_data_source_service()
+        
+        # Get the data source schema if specified
         schema = None
         if request.data_source_id:
-            ds_service = get_data_source_service()
-            source = await ds_service.get_data_source(request.data_source_id)
-            if source and source.schema_data:
-                schema = source.schema_data
+            schema = await ds_service.get_cached_schema(request.data_source_id)
         
         # Generate AI response
         llm_service = get_llm_service()
         
+        # Copy only the previous messages the LLM uses, excluding the current one
+        prior_history = history[-llm_service.HISTORY_LIMIT - 1:-1]
+        
         if schema:
             # Chat with data context
             response = await llm_service.chat_with_data(
                 message=request.message,
                 schema=schema,
-                conversation_history=history[:-1],  # Exclude current message
+                conversation_history=prior_history,
             )
         else:
             # General chat without data context
-            response = await self._general_chat(request.message, history[:-1])
+            response = await self._general_chat(request.message, prior_history)
         
         # Execute SQL if generated
         query_result = None
         if response.get("sql_query") and request.data_source_id:
             try:
-                ds_service = get_data_source_service()
                 query_result = await ds_service.execute_query(
                     request.data_source_id,
                     response["sql_query"],
                 )
             except Exception as e:
-                logger.warning(f"Failed to execute generated SQL: {e}")
+                logger.warning("Failed to execute generated SQL: %s", e)
         
         # Add assistant message to history
         assistant_message = {
             "role": "assistant",
             "content": response["message"],
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "sql_query": response.get("sql_query"),
         }
         history.append(assistant_message)
+        if len(history) > settings.chat_max_messages:
+            del history[:len(history) - settings.chat_max_messages]
         
         return ChatResponse(
             message=response["message"],
@@ -105,7 +125,7 @@ class ChatService:
             messages.append(ChatMessage(
                 role=msg["role"],
                 content=msg["content"],
-                timestamp=datetime.fromisoformat(msg["timestamp"]),
+                timestamp=msg["timestamp"],
                 sql_query=msg.get("sql_query"),
             ))
         
@@ -123,9 +143,9 @@ class ChatService:
     ) -> List[str]:
         """Get suggested questions for a data source."""
         ds_service = get_data_source_service()
-        source = await ds_service.get_data_source(data_source_id)
+        schema = await ds_service.get_cached_schema(data_source_id)
         
-        if not source or not source.schema_data:
+        if not schema:
             return [
                 "What tables are available?",
                 "Show me a sample of the data",
@@ -133,9 +153,9 @@ class ChatService:
             ]
         
         # Generate suggestions based on schema
-        tables = [t.name for t in source.schema_data.tables[:5]]
+        first_table = schema.tables[0] if schema.tables else None
         suggestions = [
-            f"What data is in the {tables[0]} table?" if tables else "What tables are available?",
+            f"What data is in the {first_table.name} table?" if first_table else "What tables are available?",
             "Show me the top 10 records",
             "What are the trends in the data?",
             "Find any anomalies in the data",
@@ -149,16 +169,7 @@ class ChatService:
     ) -> Dict[str, Any]:
         """Handle general chat without data context."""
         # Simple fallback when no data source is selected
-        return {
-            "message": "Please select a data source to start analyzing your data. "
-                      "Once connected, I can help you explore your data, run queries, "
-                      "and generate insights.",
-            "suggestions": [
-                "Connect to a PostgreSQL database",
-                "Upload a CSV file",
-                "Connect to a REST API",
-            ],
-        }
+        return _GENERAL_CHAT_RESPONSE
 
 
 # Singleton instance
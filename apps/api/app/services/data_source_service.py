@@ -1,9 +1,11 @@
 import logging
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 import uuid
 
 from app.models import (
+    ConnectionConfig,
     DataSourceType,
     ConnectionStatus,
     DataSourceCreate,
@@ -14,11 +16,44 @@ from app.models import (
     QueryColumn,
     SampleDataResponse,
 )
-from app.connectors import get_connector
+from app.connectors import use_connector, release_connector
 from app.services.llm_service import get_llm_service
 
 logger = logging.getLogger(__name__)
 
+# SQL dialect the LLM should generate for each data source type
+_DIALECTS: Dict[DataSourceType, str] = {
+    DataSourceType.POSTGRESQL: "postgresql",
+    DataSourceType.MYSQL: "mysql",
+    DataSourceType.SQLITE: "sqlite",
+    DataSourceType.SNOWFLAKE: "snowflake",
+    DataSourceType.BIGQUERY: "bigquery",
+    DataSourceType.REDSHIFT: "redshift",
+    DataSourceType.CSV: "duckdb",
+}
+
+
+@dataclass(slots=True)
+class DataSourceRecord:
+    """A stored data source."""
+    id: str
+    name: str
+    type: DataSourceType
+    description: Optional[str]
+    config: ConnectionConfig
+    status: ConnectionStatus
+    created_at: datetime
+    updated_at: datetime
+    schema_data: Optional[DatabaseSchema] = None
+    last_synced: Optional[datetime] = None
+    # Response model built from the fields above, reused until any of them changes
+    response: Optional[DataSourceResponse] = None
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "response":
+            object.__setattr__(self, "response", None)
+
 
 class DataSourceService:
     """Service for managing data sources."""
@@ -26,7 +61,7 @@ class DataSourceService:
     def __init__(self):
         # In-memory storage for demo purposes
         # In production, use a proper database
-        self._data_sources: Dict[str, Dict[str, Any]] = {}
+        self._data_sources: Dict[str, DataSourceRecord] = {}
         self._schemas: Dict[str, DatabaseSchema] = {}
     
     async def create_data_source(self, data: DataSourceCreate) -> DataSourceResponse:
@@ -34,38 +69,37 @@ class DataSourceService:
         source_id = str(uuid.uuid4())
         now = datetime.utcnow()
         
-        # Test connection first
-        connector = get_connector(data.type, data.config)
-        success, error = await connector.test_connection()
-        
-        if not success:
-            raise ValueError(f"Connection failed: {error}")
+        # Sync the schema first: on success it has proven the connection over the
+        # same pooled connection, so a separate connection test is only needed on failure
+        schema: Optional[DatabaseSchema] = None
+        async with use_connector(source_id, data.type, data.config) as connector:
+            try:
+                schema = await connector.get_schema()
+            except Exception as e:
+                success, error = await connector.test_connection()
+                if not success:
+                    # The source is not stored, so nothing else would release its connector
+                    await release_connector(source_id)
+                    raise ValueError(f"Connection failed: {error}")
+                logger.warning("Failed to sync schema: %s", e)
         
-        # Store the data source
-        source_data = {
-            "id": source_id,
-            "name": data.name,
-            "type": data.type,
-            "description": data.description,
-            "config": data.config.model_dump(),
-            "status": ConnectionStatus.CONNECTED,
-            "schema_data": None,
-            "last_synced": None,
-            "created_at": now,
-            "updated_at": now,
-        }
+        # Store the data source; the validated config is reused on every call
+        source_data = DataSourceRecord(
+            id=source_id,
+            name=data.name,
+            type=data.type,
+            description=data.description,
+            config=data.config,
+            status=ConnectionStatus.CONNECTED,
+            created_at=now,
+            updated_at=now,
+            schema_data=schema,
+            last_synced=datetime.utcnow() if schema else None,
+        )
         
         self._data_sources[source_id] = source_data
-        
-        # Sync schema in background (simplified for now)
-        try:
-            async with connector:
-                schema = await connector.get_schema()
-                self._schemas[source_id] = schema
-                source_data["schema_data"] = schema
-                source_data["last_synced"] = datetime.utcnow()
-        except Exception as e:
-            logger.warning(f"Failed to sync schema: {e}")
+        if schema:
+            self._schemas[source_id] = schema
         
         return self._to_response(source_data)
     
@@ -76,6 +110,10 @@ class DataSourceService:
             return None
         return self._to_response(source_data)
     
+    async def get_cached_schema(self, source_id: str) -> Optional[DatabaseSchema]:
+        """Get the last synced schema of a data source, without building a response model."""
+        return self._schemas.get(source_id)
+    
     async def list_data_sources(self) -> List[DataSourceResponse]:
         """List all data sources."""
         return [self._to_response(s) for s in self._data_sources.values()]
@@ -89,20 +127,27 @@ class DataSourceService:
             return None
         
         if data.name is not None:
-            source_data["name"] = data.name
+            source_data.name = data.name
         if data.description is not None:
-            source_data["description"] = data.description
+            source_data.description = data.description
         if data.config is not None:
-            source_data["config"] = data.config.model_dump()
+            # Drop the pooled connector for the previous config
+            await release_connector(source_id)
+            source_data.config = data.config
+            # The synced schema describes the previous source
+            self._schemas.pop(source_id, None)
+            source_data.schema_data = None
+            source_data.last_synced = None
         
-        source_data["updated_at"] = datetime.utcnow()
+        source_data.updated_at = datetime.utcnow()
         
         return self._to_response(source_data)
     
     async def delete_data_source(self, source_id: str) -> bool:
         """Delete a data source."""
         if source_id in self._data_sources:
-            del self._data_sources[source_id]
+            self._data_sources.pop(source_id)
+            await release_connector(source_id)
             if source_id in self._schemas:
                 del self._schemas[source_id]
             return True
@@ -114,16 +159,13 @@ class DataSourceService:
         if not source_data:
             return {"success": False, "error": "Data source not found"}
         
-        from app.models import ConnectionConfig
-        config = ConnectionConfig(**source_data["config"])
-        connector = get_connector(source_data["type"], config)
-        
-        success, error = await connector.test_connection()
+        async with use_connector(source_id, source_data.type, source_data.config) as connector:
+            success, error = await connector.test_connection()
         
         if success:
-            source_data["status"] = ConnectionStatus.CONNECTED
+            source_data.status = ConnectionStatus.CONNECTED
         else:
-            source_data["status"] = ConnectionStatus.ERROR
+            source_data.status = ConnectionStatus.ERROR
         
         return {"success": success, "error": error}
     
@@ -133,22 +175,22 @@ class DataSourceService:
         if not source_data:
             raise ValueError("Data source not found")
         
-        from app.models import ConnectionConfig
-        config = ConnectionConfig(**source_data["config"])
-        connector = get_connector(source_data["type"], config)
+        # Start from a fresh connector so file and API sources are re-read; queries
+        # still running on the previous one finish before it is closed
+        await release_connector(source_id)
         
-        source_data["status"] = ConnectionStatus.SYNCING
+        source_data.status = ConnectionStatus.SYNCING
         
         try:
-            async with connector:
+            async with use_connector(source_id, source_data.type, source_data.config) as connector:
                 schema = await connector.get_schema()
-                self._schemas[source_id] = schema
-                source_data["schema_data"] = schema
-                source_data["last_synced"] = datetime.utcnow()
-                source_data["status"] = ConnectionStatus.CONNECTED
-                return schema
+            self._schemas[source_id] = schema
+            source_data.schema_data = schema
+            source_data.last_synced = datetime.utcnow()
+            source_data.status = ConnectionStatus.CONNECTED
+            return schema
         except Exception as e:
-            source_data["status"] = ConnectionStatus.ERROR
+            source_data.status = ConnectionStatus.ERROR
             raise
     
     async def execute_query(
@@ -159,20 +201,16 @@ class DataSourceService:
         if not source_data:
             raise ValueError("Data source not found")
         
-        from app.models import ConnectionConfig
-        config = ConnectionConfig(**source_data["config"])
-        connector = get_connector(source_data["type"], config)
-        
-        async with connector:
+        async with use_connector(source_id, source_data.type, source_data.config) as connector:
             columns, rows, exec_time = await connector.execute_query(query, limit, timeout)
-            
-            return QueryResult(
-                columns=columns,
-                rows=rows,
-                row_count=len(rows),
-                execution_time_ms=exec_time,
-                query=query,
-            )
+        
+        return QueryResult(
+            columns=columns,
+            rows=rows,
+            row_count=len(rows),
+            execution_time_ms=exec_time,
+            query=query,
+        )
     
     async def execute_nl_query(
         self, source_id: str, question: str
@@ -192,7 +230,7 @@ class DataSourceService:
         result = await llm.natural_language_to_sql(
             question=question,
             schema=schema,
-            dialect=self._get_dialect(source_data["type"]),
+            dialect=self._get_dialect(source_data.type),
         )
         
         sql = result["sql"]
@@ -213,52 +251,41 @@ class DataSourceService:
         if not source_data:
             raise ValueError("Data source not found")
         
-        from app.models import ConnectionConfig
-        config = ConnectionConfig(**source_data["config"])
-        connector = get_connector(source_data["type"], config)
-        
-        async with connector:
+        async with use_connector(source_id, source_data.type, source_data.config) as connector:
             columns, rows = await connector.get_sample_data(table_name, sample_size, random_sample)
-            
-            # Calculate basic statistics
-            statistics = self._calculate_statistics(columns, rows)
-            
-            return SampleDataResponse(
-                data_source_id=source_id,
-                table_name=table_name,
-                sample_size=len(rows),
-                columns=columns,
-                rows=rows,
-                statistics=statistics,
-            )
-    
-    def _to_response(self, data: Dict[str, Any]) -> DataSourceResponse:
-        """Convert internal data to response model."""
-        from app.models import ConnectionConfig
-        return DataSourceResponse(
-            id=data["id"],
-            name=data["name"],
-            type=data["type"],
-            description=data["description"],
-            config=ConnectionConfig(**data["config"]),
-            status=data["status"],
-            schema_data=data.get("schema_data"),
-            last_synced=data.get("last_synced"),
-            created_at=data["created_at"],
-            updated_at=data["updated_at"],
+        
+        # Calculate basic statistics
+        statistics = self._calculate_statistics(columns, rows)
+        
+        return SampleDataResponse(
+            data_source_id=source_id,
+            table_name=table_name,
+            sample_size=len(rows),
+            columns=columns,
+            rows=rows,
+            statistics=statistics,
         )
     
+    def _to_response(self, data: DataSourceRecord) -> DataSourceResponse:
+        """Convert internal data to response model, reusing it while the record is unchanged."""
+        if data.response is None:
+            data.response = DataSourceResponse(
+                id=data.id,
+                name=data.name,
+                type=data.type,
+                description=data.description,
+                config=data.config,
+                status=data.status,
+                schema_data=data.schema_data,
+                last_synced=data.last_synced,
+                created_at=data.created_at,
+                updated_at=data.updated_at,
+            )
+        return data.response
+    
     def _get_dialect(self, data_type: DataSourceType) -> str:
         """Get SQL dialect for a data source type."""
-        dialects = {
-            DataSourceType.POSTGRESQL: "postgresql",
-            DataSourceType.MYSQL: "mysql",
-            DataSourceType.SQLITE: "sqlite",
-            DataSourceType.SNOWFLAKE: "snowflake",
-            DataSourceType.BIGQUERY: "bigquery",
-            DataSourceType.REDSHIFT: "redshift",
-        }
-        return dialects.get(data_type, "sql")
+        return _DIALECTS.get(data_type, "sql")
     
     def _calculate_statistics(
         self, columns: List[QueryColumn], rows: List[List[Any]]
@@ -268,12 +295,15 @@ class DataSourceService:
             return {}
         
         stats = {}
-        for i, col in enumerate(columns):
-            col_values = [row[i] for row in rows if row[i] is not None]
+        # Transpose once so each column is scanned as one contiguous tuple
+        for col, values in zip(columns, zip(*rows)):
+            col_values = [v for v in values if v is not None]
+            # Converted once; shared by the distinct count and the string statistics
+            col_texts = list(map(str, col_values))
             
             col_stats = {
                 "null_count": len(rows) - len(col_values),
-                "distinct_count": len(set(str(v) for v in col_values)),
+                "distinct_count": len(set(col_texts)),
             }
             
             # Numeric statistics
@@ -286,10 +316,10 @@ class DataSourceService:
             
             # String statistics
             elif col.type == "string":
-                string_values = [str(v) for v in col_values]
-                if string_values:
-                    col_stats["min_length"] = min(len(s) for s in string_values)
-                    col_stats["max_length"] = max(len(s) for s in string_values)
+                if col_texts:
+                    lengths = list(map(len, col_texts))
+                    col_stats["min_length"] = min(lengths)
+                    col_stats["max_length"] = max(lengths)
             
             stats[col.name] = col_stats
         
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 from datetime import datetime
@@ -21,8 +22,9 @@ class InsightService:
     """Service for managing AI-generated insights."""
     
     def __init__(self):
-        # In-memory storage for demo purposes
-        self._insights: Dict[str, Dict[str, Any]] = {}
+        # In-memory storage for demo purposes; insights are stored as response
+        # models in creation order, so listing needs neither conversion nor a sort
+        self._insights: Dict[str, InsightResponse] = {}
     
     async def generate_insights(
         self, request: GenerateInsightsRequest
@@ -31,35 +33,33 @@ class InsightService:
         ds_service = get_data_source_service()
         llm_service = get_llm_service()
         
-        # Get data source
-        source = await ds_service.get_data_source(request.data_source_id)
-        if not source:
-            raise ValueError("Data source not found")
-        
-        # Get schema
-        schema = source.schema_data
+        # Get schema; syncing raises for an unknown data source
+        schema = await ds_service.get_cached_schema(request.data_source_id)
         if not schema:
             schema = await ds_service.sync_schema(request.data_source_id)
         
-        # Get sample data from each table
-        sample_data = {}
-        for table in schema.tables[:5]:  # Limit to first 5 tables
+        async def sample_rows(table_name: str) -> Optional[List[Dict[str, Any]]]:
             try:
                 sample = await ds_service.get_sample_data(
                     request.data_source_id,
-                    table.name,
-                    sample_size=50,
+                    table_name,
+                    sample_size=llm_service.INSIGHT_SAMPLE_ROWS,
                 )
-                # Convert to list of dicts for LLM
-                rows_as_dicts = []
-                for row in sample.rows:
-                    row_dict = {
-                        col.name: row[i] for i, col in enumerate(sample.columns)
-                    }
-                    rows_as_dicts.append(row_dict)
-                sample_data[table.name] = rows_as_dicts
             except Exception as e:
-                logger.warning(f"Failed to get sample from {table.name}: {e}")
+                logger.warning("Failed to get sample from %s: %s", table_name, e)
+                return None
+            # Convert to list of dicts for LLM
+            column_names = [col.name for col in sample.columns]
+            return [dict(zip(column_names, row)) for row in sample.rows]
+        
+        # Sample the first 5 tables concurrently, so the wait is one round-trip rather than five
+        tables = schema.tables[:5]
+        samples = await asyncio.gather(*(sample_rows(table.name) for table in tables))
+        sample_data = {
+            table.name: rows
+            for table, rows in zip(tables, samples)
+            if rows is not None
+        }
         
         # Generate insights using LLM
         raw_insights = await llm_service.analyze_data_for_insights(
@@ -69,11 +69,11 @@ class InsightService:
             max_insights=request.max_insights,
         )
         
-        # Store and return insights
+        # Store and return insights; one generation run shares its timestamp
+        now = datetime.utcnow()
         insights = []
         for raw in raw_insights:
             insight_id = str(uuid.uuid4())
-            now = datetime.utcnow()
             
             # Parse metrics
             metrics = []
@@ -99,17 +99,15 @@ class InsightService:
                 "acknowledged": False,
             }
             
-            self._insights[insight_id] = insight_data
-            insights.append(self._to_response(insight_data))
+            insight = self._to_response(insight_data)
+            self._insights[insight_id] = insight
+            insights.append(insight)
         
         return insights
     
     async def get_insight(self, insight_id: str) -> Optional[InsightResponse]:
         """Get an insight by ID."""
-        insight_data = self._insights.get(insight_id)
-        if not insight_data:
-            return None
-        return self._to_response(insight_data)
+        return self._insights.get(insight_id)
     
     async def list_insights(
         self,
@@ -118,27 +116,20 @@ class InsightService:
         severity: Optional[InsightSeverity] = None,
     ) -> List[InsightResponse]:
         """List insights with optional filters."""
-        insights = []
-        
-        for insight_data in self._insights.values():
-            if data_source_id and insight_data["data_source_id"] != data_source_id:
-                continue
-            if insight_type and insight_data["type"] != insight_type:
-                continue
-            if severity and insight_data["severity"] != severity:
-                continue
-            
-            insights.append(self._to_response(insight_data))
-        
-        # Sort by created_at descending
-        insights.sort(key=lambda x: x.created_at, reverse=True)
-        
-        return insights
+        # Newest first, which is reverse insertion order
+        return [
+            insight
+            for insight in reversed(self._insights.values())
+            if (not data_source_id or insight.data_source_id == data_source_id)
+            and (not insight_type or insight.type == insight_type)
+            and (not severity or insight.severity == severity)
+        ]
     
     async def acknowledge_insight(self, insight_id: str) -> bool:
         """Mark an insight as acknowledged."""
-        if insight_id in self._insights:
-            self._insights[insight_id]["acknowledged"] = True
+        insight = self._insights.get(insight_id)
+        if insight is not None:
+            self._insights[insight_id] = insight.model_copy(update={"acknowledged": True})
             return True
         return False
     
@@ -1,8 +1,10 @@
-import json
+import hashlib
 import logging
 from typing import Any, Dict, List, Optional
+import orjson
 from openai import AsyncOpenAI, AsyncAzureOpenAI
 
+from app.core.cache import LRUCache
 from app.core.config import settings
 from app.models import (
     DatabaseSchema,
@@ -14,10 +16,44 @@ from app.models import (
 
 logger = logging.getLogger(__name__)
 
+# Completions of near-deterministic prompts, keyed by a hash of the full request
+_completion_cache = LRUCache(maxsize=settings.llm_cache_size)
+
+# Prompts at or below this temperature are cached; chat keeps its variety
+_CACHE_MAX_TEMPERATURE = 0.2
+
+# Formatted schema prompts kept per service, one per recently used schema
+_SCHEMA_PROMPT_CACHE_SIZE = 64
+
+# Longer text values in sample rows are cut so one wide column cannot fill the prompt
+_MAX_CELL_CHARS = 200
+
+
+# Indented JSON for prompts; non-string keys and unknown types are stringified
+_PROMPT_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def _dump_for_prompt(value: Any) -> str:
+    """Serialize a value as indented JSON text for a prompt."""
+    return orjson.dumps(value, default=str, option=_PROMPT_JSON_OPTIONS).decode()
+
+
+def _truncate_cell(value: Any) -> Any:
+    """Shorten a long string cell for a prompt, leaving other values as they are."""
+    if isinstance(value, str) and len(value) > _MAX_CELL_CHARS:
+        return value[:_MAX_CELL_CHARS] + "..."
+    return value
+
 
 class LLMService:
     """Service for LLM-powered data intelligence."""
     
+    # Number of previous conversation messages sent with a chat request
+    HISTORY_LIMIT = 10
+    
+    # Number of sample rows per table shown in the insights prompt
+    INSIGHT_SAMPLE_ROWS = 5
+    
     def __init__(self):
         self.is_azure = settings.use_azure_openai and settings.azure_openai_endpoint
         
@@ -29,12 +65,16 @@ class LLMService:
                 api_version=settings.azure_openai_api_version,
             )
             self.model = settings.azure_openai_deployment or "gpt-4o-mini"
-            logger.info(f"Using Azure OpenAI with deployment: {self.model}")
+            logger.info("Using Azure OpenAI with deployment: %s", self.model)
         else:
             # Use OpenAI directly
             self.client = AsyncOpenAI(api_key=settings.openai_api_key)
             self.model = settings.openai_model
-            logger.info(f"Using OpenAI with model: {self.model}")
+            logger.info("Using OpenAI with model: %s", self.model)
+        
+        # Synced schemas are replaced rather than mutated, so a schema object's
+        # identity is enough to reuse its formatted text
+        self._schema_prompts = LRUCache(maxsize=_SCHEMA_PROMPT_CACHE_SIZE)
     
     def _get_completion_kwargs(self, temperature: float = 0.3) -> Dict[str, Any]:
         """Get kwargs for chat completion, handling Azure limitations."""
@@ -47,6 +87,25 @@ class LLMService:
             kwargs["temperature"] = temperature
         return kwargs
     
+    async def _complete(self, messages: List[Dict[str, str]], temperature: float = 0.3) -> str:
+        """Run a chat completion and return the message content, reusing cached low-temperature results."""
+        kwargs = self._get_completion_kwargs(temperature=temperature)
+        kwargs["messages"] = messages
+        
+        cache_key = None
+        if temperature <= _CACHE_MAX_TEMPERATURE:
+            cache_key = hashlib.sha256(orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS)).hexdigest()
+            cached = _completion_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        response = await self.client.chat.completions.create(**kwargs)
+        content = response.choices[0].message.content
+        
+        if cache_key is not None:
+            _completion_cache.set(cache_key, content, ttl=settings.llm_cache_ttl)
+        return content
+    
     async def natural_language_to_sql(
         self,
         question: str,
@@ -79,18 +138,18 @@ Respond in JSON format:
 {{"sql": "SELECT ...", "explanation": "Brief explanation of what the query does"}}"""
 
         try:
-            kwargs = self._get_completion_kwargs(temperature=0.1)
-            kwargs["messages"] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": question},
-            ]
-            response = await self.client.chat.completions.create(**kwargs)
-            
-            result = json.loads(response.choices[0].message.content)
+            content = await self._complete(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": question},
+                ],
+                temperature=0.1,
+            )
+            result = orjson.loads(content)
             return result
             
         except Exception as e:
-            logger.error(f"NL to SQL conversion failed: {e}")
+            logger.error("NL to SQL conversion failed: %s", e)
             raise
     
     async def analyze_data_for_insights(
@@ -111,7 +170,11 @@ Respond in JSON format:
         for table_name, rows in sample_data.items():
             sample_text += f"\n{table_name} (sample of {len(rows)} rows):\n"
             if rows:
-                sample_text += json.dumps(rows[:5], indent=2, default=str)
+                shown_rows = [
+                    {name: _truncate_cell(value) for name, value in row.items()}
+                    for row in rows[:self.INSIGHT_SAMPLE_ROWS]
+                ]
+                sample_text += _dump_for_prompt(shown_rows)
         
         focus_text = ""
         if focus_areas:
@@ -151,18 +214,18 @@ Respond in JSON format:
 }}"""
 
         try:
-            kwargs = self._get_completion_kwargs(temperature=0.3)
-            kwargs["messages"] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": "Analyze this data and provide insights."},
-            ]
-            response = await self.client.chat.completions.create(**kwargs)
-            
-            result = json.loads(response.choices[0].message.content)
+            content = await self._complete(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": "Analyze this data and provide insights."},
+                ],
+                temperature=0.3,
+            )
+            result = orjson.loads(content)
             return result.get("insights", [])
             
         except Exception as e:
-            logger.error(f"Data analysis failed: {e}")
+            logger.error("Data analysis failed: %s", e)
             raise
     
     async def explain_schema(self, schema: DatabaseSchema) -> Dict[str, Any]:
@@ -193,18 +256,18 @@ Respond in JSON format:
 }}"""
 
         try:
-            kwargs = self._get_completion_kwargs(temperature=0.2)
-            kwargs["messages"] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": "Explain this database schema."},
-            ]
-            response = await self.client.chat.completions.create(**kwargs)
-            
-            result = json.loads(response.choices[0].message.content)
+            content = await self._complete(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": "Explain this database schema."},
+                ],
+                temperature=0.2,
+            )
+            result = orjson.loads(content)
             return result
             
         except Exception as e:
-            logger.error(f"Schema explanation failed: {e}")
+            logger.error("Schema explanation failed: %s", e)
             raise
     
     async def chat_with_data(
@@ -246,7 +309,7 @@ Respond in JSON format:
         messages = [{"role": "system", "content": system_prompt}]
         
         # Add conversation history
-        for msg in conversation_history[-10:]:  # Keep last 10 messages
+        for msg in conversation_history[-self.HISTORY_LIMIT:]:
             messages.append({
                 "role": msg.get("role", "user"),
                 "content": msg.get("content", ""),
@@ -255,15 +318,12 @@ Respond in JSON format:
         messages.append({"role": "user", "content": message})
         
         try:
-            kwargs = self._get_completion_kwargs(temperature=0.3)
-            kwargs["messages"] = messages
-            response = await self.client.chat.completions.create(**kwargs)
-            
-            result = json.loads(response.choices[0].message.content)
+            content = await self._complete(messages, temperature=0.3)
+            result = orjson.loads(content)
             return result
             
         except Exception as e:
-            logger.error(f"Chat failed: {e}")
+            logger.error("Chat failed: %s", e)
             raise
     
     async def generate_data_summary(
@@ -278,15 +338,15 @@ Respond in JSON format:
         """
         stats_text = ""
         if statistics:
-            stats_text = f"\nStatistics:\n{json.dumps(statistics, indent=2, default=str)}"
+            stats_text = f"\nStatistics:\n{_dump_for_prompt(statistics)}"
         
         system_prompt = f"""Analyze this table data and provide a summary.
 
 Table: {table_name}
-Columns: {json.dumps(columns, indent=2)}
+Columns: {_dump_for_prompt(columns)}
 
 Sample Data:
-{json.dumps(sample_data[:10], indent=2, default=str)}
+{_dump_for_prompt(sample_data[:10])}
 {stats_text}
 
 Provide:
@@ -304,22 +364,33 @@ Respond in JSON format:
 }}"""
 
         try:
-            kwargs = self._get_completion_kwargs(temperature=0.2)
-            kwargs["messages"] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": "Summarize this table."},
-            ]
-            response = await self.client.chat.completions.create(**kwargs)
-            
-            result = json.loads(response.choices[0].message.content)
+            content = await self._complete(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": "Summarize this table."},
+                ],
+                temperature=0.2,
+            )
+            result = orjson.loads(content)
             return result
             
         except Exception as e:
-            logger.error(f"Table summary generation failed: {e}")
+            logger.error("Table summary generation failed: %s", e)
             raise
     
     def _format_schema_for_prompt(self, schema: DatabaseSchema) -> str:
-        """Format database schema for LLM prompt."""
+        """Format database schema for LLM prompt, reusing the text for a schema seen before."""
+        # The schema is stored with its text, so its id cannot be reused while cached
+        entry = self._schema_prompts.get(id(schema))
+        if entry is not None and entry[0] is schema:
+            return entry[1]
+        
+        text = self._render_schema_for_prompt(schema)
+        self._schema_prompts.set(id(schema), (schema, text))
+        return text
+    
+    def _render_schema_for_prompt(self, schema: DatabaseSchema) -> str:
+        """Build the prompt text for a database schema."""
         lines = []
         for table in schema.tables:
             lines.append(f"\nTable: {table.name}")
@@ -3,7 +3,8 @@ from typing import Any, Dict, List, Optional
 from datetime import datetime
 import uuid
 
-from slack_sdk import WebClient
+import aiohttp
+from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
 
 from app.models import (
@@ -18,6 +19,27 @@ from app.services.llm_service import get_llm_service
 
 logger = logging.getLogger(__name__)
 
+# Connection limit for the HTTP session shared by all Slack integrations
+_SESSION_CONNECTION_LIMIT = 100
+
+# Session shared by every integration's client; each client sends its own bot token
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+# Emoji shown for an insight's severity and type in Slack messages
+_SEVERITY_EMOJI = {
+    "low": "ℹ️",
+    "medium": "⚠️",
+    "high": "🚨",
+    "critical": "🔴",
+}
+_TYPE_EMOJI = {
+    "trend": "📈",
+    "anomaly": "🔍",
+    "correlation": "🔗",
+    "recommendation": "💡",
+    "summary": "📊",
+}
+
 
 class SlackService:
     """Service for Slack integration."""
@@ -25,7 +47,7 @@ class SlackService:
     def __init__(self):
         # In-memory storage for integrations
         self._integrations: Dict[str, Dict[str, Any]] = {}
-        self._clients: Dict[str, WebClient] = {}
+        self._clients: Dict[str, AsyncWebClient] = {}
     
     async def create_integration(
         self, data: IntegrationCreate
@@ -38,12 +60,12 @@ class SlackService:
         now = datetime.utcnow()
         
         # Test the connection
-        client = WebClient(token=data.slack_config.bot_token)
+        client = AsyncWebClient(token=data.slack_config.bot_token, session=_get_shared_session())
         try:
-            auth_response = client.auth_test()
+            auth_response = await client.auth_test()
             status = ConnectionStatus.CONNECTED
         except SlackApiError as e:
-            logger.error(f"Slack auth failed: {e}")
+            logger.error("Slack auth failed: %s", e)
             raise ValueError(f"Slack authentication failed: {e.response['error']}")
         
         integration_data = {
@@ -51,13 +73,15 @@ class SlackService:
             "type": IntegrationType.SLACK,
             "name": data.name,
             "enabled": data.enabled,
-            "config": data.slack_config.model_dump(),
+            "config": data.slack_config,
             "status": status,
             "bot_id": auth_response.get("bot_id"),
             "team_id": auth_response.get("team_id"),
             "team_name": auth_response.get("team"),
             "last_message_at": None,
             "created_at": now,
+            # Built on first read and cleared whenever the record changes
+            "response": None,
         }
         
         self._integrations[integration_id] = integration_data
@@ -74,11 +98,8 @@ class SlackService:
     
     async def list_integrations(self) -> List[IntegrationResponse]:
         """List all Slack integrations."""
-        return [
-            self._to_response(data) 
-            for data in self._integrations.values()
-            if data["type"] == IntegrationType.SLACK
-        ]
+        # Only Slack integrations are ever stored here, so no type filter is needed
+        return [self._to_response(data) for data in self._integrations.values()]
     
     async def delete_integration(self, integration_id: str) -> bool:
         """Delete a Slack integration."""
@@ -100,15 +121,20 @@ class SlackService:
         client = self._clients.get(integration_id)
         if not client:
             raise ValueError("Integration not found")
+        data = self._integrations[integration_id]
+        if not data["enabled"]:
+            return {"success": False, "reason": "disabled"}
         
         try:
-            response = client.chat_postMessage(
+            response = await client.chat_postMessage(
                 channel=channel,
                 text=message,
                 blocks=blocks,
             )
             
-            self._integrations[integration_id]["last_message_at"] = datetime.utcnow()
+            # Update the record read before the post; it may have been deleted meanwhile
+            data["last_message_at"] = datetime.utcnow()
+            data["response"] = None
             
             return {
                 "success": True,
@@ -116,7 +142,7 @@ class SlackService:
                 "channel": response["channel"],
             }
         except SlackApiError as e:
-            logger.error(f"Slack message failed: {e}")
+            logger.error("Slack message failed: %s", e)
             raise
     
     async def send_insight(
@@ -126,23 +152,13 @@ class SlackService:
         insight: Dict[str, Any],
     ) -> Dict[str, Any]:
         """Send an insight as a formatted Slack message."""
-        severity_emoji = {
-            "low": "ℹ️",
-            "medium": "⚠️",
-            "high": "🚨",
-            "critical": "🔴",
-        }
-        
-        type_emoji = {
-            "trend": "📈",
-            "anomaly": "🔍",
-            "correlation": "🔗",
-            "recommendation": "💡",
-            "summary": "📊",
-        }
+        data = self._integrations.get(integration_id)
+        if data is not None and not data["enabled"]:
+            # Skip building blocks that send_message would not send
+            return {"success": False, "reason": "disabled"}
         
-        emoji = severity_emoji.get(insight.get("severity", "low"), "ℹ️")
-        type_icon = type_emoji.get(insight.get("type", "summary"), "📊")
+        emoji = _SEVERITY_EMOJI.get(insight.get("severity", "low"), "ℹ️")
+        type_icon = _TYPE_EMOJI.get(insight.get("type", "summary"), "📊")
         
         blocks = [
             {
@@ -210,6 +226,13 @@ class SlackService:
                 "text": f"Unknown command: {command}",
             }
     
+    async def handle_event(self, event: Dict[str, Any]) -> None:
+        """
+        Hook run for each Slack event after the webhook has been acknowledged.
+        No event types are acted on yet, so events are only logged.
+        """
+        logger.debug("Received Slack event: %s", event.get("type"))
+    
     async def _handle_query_command(
         self, integration_id: str, query: str, channel: str
     ) -> Dict[str, Any]:
@@ -239,16 +262,19 @@ class SlackService:
         }
     
     def _to_response(self, data: Dict[str, Any]) -> IntegrationResponse:
-        """Convert internal data to response model."""
-        return IntegrationResponse(
-            id=data["id"],
-            type=data["type"],
-            name=data["name"],
-            enabled=data["enabled"],
-            status=data["status"],
-            last_message_at=data.get("last_message_at"),
-            created_at=data["created_at"],
-        )
+        """Convert internal data to response model, reusing it until the record changes."""
+        response = data.get("response")
+        if response is None:
+            response = data["response"] = IntegrationResponse(
+                id=data["id"],
+                type=data["type"],
+                name=data["name"],
+                enabled=data["enabled"],
+                status=data["status"],
+                last_message_at=data.get("last_message_at"),
+                created_at=data["created_at"],
+            )
+        return response
 
 
 # Singleton instance
@@ -261,3 +287,21 @@ def get_slack_service() -> SlackService:
     if _slack_service is None:
         _slack_service = SlackService()
     return _slack_service
+
+
+def _get_shared_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session, creating it on first use."""
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=_SESSION_CONNECTION_LIMIT),
+        )
+    return _shared_session
+
+
+async def close_clients() -> None:
+    """Close the shared HTTP session. Call once at application shutdown."""
+    global _shared_session
+    if _shared_session is not None:
+        await _shared_session.close()
+        _shared_session = None
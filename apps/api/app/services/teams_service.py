@@ -4,6 +4,7 @@ from datetime import datetime
 import uuid
 
 import httpx
+import orjson
 
 from app.models import (
     ConnectionStatus,
@@ -15,6 +16,45 @@ from app.models import (
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive limits for the shared webhook client
+_CLIENT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# Client shared by all Teams integrations, so repeat webhook posts reuse connections
+_shared_client: Optional[httpx.AsyncClient] = None
+
+# The connection test card never changes, so it is encoded once
+_TEST_CARD_BODY = orjson.dumps({
+    "@type": "MessageCard",
+    "@context": "http://schema.org/extensions",
+    "summary": "Tuple Connection Test",
+    "sections": [{
+        "activityTitle": "✅ Tuple Connected",
+        "activitySubtitle": "Your Tuple integration is working!",
+        "text": "You will now receive data insights and notifications in this channel.",
+    }],
+})
+
+# Cards are posted as pre-encoded JSON bodies
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Insight card accent color by severity
+_DEFAULT_THEME_COLOR = "0076D7"
+_SEVERITY_THEME_COLORS = {
+    "low": _DEFAULT_THEME_COLOR,
+    "medium": "FF9800",
+    "high": "FF5252",
+    "critical": "FF5252",
+}
+
+# Icon shown before an insight's title by insight type
+_TYPE_ICONS = {
+    "trend": "📈",
+    "anomaly": "🔍",
+    "correlation": "🔗",
+    "recommendation": "💡",
+    "summary": "📊",
+}
+
 
 class TeamsService:
     """Service for Microsoft Teams integration."""
@@ -38,7 +78,7 @@ class TeamsService:
             await self._test_webhook(data.teams_config.webhook_url)
             status = ConnectionStatus.CONNECTED
         except Exception as e:
-            logger.error(f"Teams webhook test failed: {e}")
+            logger.error("Teams webhook test failed: %s", e)
             raise ValueError(f"Teams webhook test failed: {str(e)}")
         
         integration_data = {
@@ -46,10 +86,12 @@ class TeamsService:
             "type": IntegrationType.TEAMS,
             "name": data.name,
             "enabled": data.enabled,
-            "config": data.teams_config.model_dump(),
+            "config": data.teams_config,
             "status": status,
             "last_message_at": None,
             "created_at": now,
+            # Built on first read and cleared whenever the record changes
+            "response": None,
         }
         
         self._integrations[integration_id] = integration_data
@@ -65,11 +107,8 @@ class TeamsService:
     
     async def list_integrations(self) -> List[IntegrationResponse]:
         """List all Teams integrations."""
-        return [
-            self._to_response(data) 
-            for data in self._integrations.values()
-            if data["type"] == IntegrationType.TEAMS
-        ]
+        # Only Teams integrations are ever stored here, so no type filter is needed
+        return [self._to_response(data) for data in self._integrations.values()]
     
     async def delete_integration(self, integration_id: str) -> bool:
         """Delete a Teams integration."""
@@ -80,24 +119,12 @@ class TeamsService:
     
     async def _test_webhook(self, webhook_url: str) -> bool:
         """Test the Teams webhook with a simple message."""
-        test_card = {
-            "@type": "MessageCard",
-            "@context": "http://schema.org/extensions",
-            "summary": "Tuple Connection Test",
-            "sections": [{
-                "activityTitle": "✅ Tuple Connected",
-                "activitySubtitle": "Your Tuple integration is working!",
-                "text": "You will now receive data insights and notifications in this channel.",
-            }],
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                webhook_url,
-                json=test_card,
-                timeout=10,
-            )
-            response.raise_for_status()
+        response = await _get_shared_client().post(
+            webhook_url,
+            content=_TEST_CARD_BODY,
+            headers=_JSON_HEADERS,
+        )
+        response.raise_for_status()
         
         return True
     
@@ -111,33 +138,28 @@ class TeamsService:
         data = self._integrations.get(integration_id)
         if not data:
             raise ValueError("Integration not found")
+        if not data["enabled"]:
+            return {"success": False, "reason": "disabled"}
         
-        webhook_url = data["config"]["webhook_url"]
+        webhook_url = data["config"].webhook_url
         
-        card = {
-            "@type": "MessageCard",
-            "@context": "http://schema.org/extensions",
-            "summary": title or "Tuple Notification",
-            "sections": [{
-                "activityTitle": title or "Tuple",
-                "text": message,
-            }],
-        }
+        card = self._build_message_card(message, title)
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    webhook_url,
-                    json=card,
-                    timeout=10,
-                )
-                response.raise_for_status()
+            response = await _get_shared_client().post(
+                webhook_url,
+                content=orjson.dumps(card),
+                headers=_JSON_HEADERS,
+            )
+            response.raise_for_status()
             
-            self._integrations[integration_id]["last_message_at"] = datetime.utcnow()
+            # Update the record read before the post; it may have been deleted meanwhile
+            data["last_message_at"] = datetime.utcnow()
+            data["response"] = None
             
             return {"success": True}
         except httpx.HTTPError as e:
-            logger.error(f"Teams message failed: {e}")
+            logger.error("Teams message failed: %s", e)
             raise
     
     async def send_insight(
@@ -149,27 +171,46 @@ class TeamsService:
         data = self._integrations.get(integration_id)
         if not data:
             raise ValueError("Integration not found")
+        if not data["enabled"]:
+            return {"success": False, "reason": "disabled"}
         
-        webhook_url = data["config"]["webhook_url"]
+        webhook_url = data["config"].webhook_url
         
-        # Build adaptive card sections
-        severity_colors = {
-            "low": "default",
-            "medium": "warning",
-            "high": "attention",
-            "critical": "attention",
-        }
+        card = self._build_insight_card(insight)
         
-        type_icons = {
-            "trend": "📈",
-            "anomaly": "🔍",
-            "correlation": "🔗",
-            "recommendation": "💡",
-            "summary": "📊",
+        try:
+            response = await _get_shared_client().post(
+                webhook_url,
+                content=orjson.dumps(card),
+                headers=_JSON_HEADERS,
+            )
+            response.raise_for_status()
+            
+            # Update the record read before the post; it may have been deleted meanwhile
+            data["last_message_at"] = datetime.utcnow()
+            data["response"] = None
+            
+            return {"success": True}
+        except httpx.HTTPError as e:
+            logger.error("Teams insight message failed: %s", e)
+            raise
+    
+    def _build_message_card(self, message: str, title: Optional[str] = None) -> Dict[str, Any]:
+        """Build the MessageCard for a plain text message."""
+        return {
+            "@type": "MessageCard",
+            "@context": "http://schema.org/extensions",
+            "summary": title or "Tuple Notification",
+            "sections": [{
+                "activityTitle": title or "Tuple",
+                "text": message,
+            }],
         }
-        
-        color = severity_colors.get(insight.get("severity", "low"), "default")
-        icon = type_icons.get(insight.get("type", "summary"), "📊")
+    
+    def _build_insight_card(self, insight: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the MessageCard for an insight."""
+        theme_color = _SEVERITY_THEME_COLORS.get(insight.get("severity", "low"), _DEFAULT_THEME_COLOR)
+        icon = _TYPE_ICONS.get(insight.get("type", "summary"), "📊")
         
         facts = [
             {"name": "Type", "value": insight.get("type", "N/A").title()},
@@ -189,7 +230,7 @@ class TeamsService:
         card = {
             "@type": "MessageCard",
             "@context": "http://schema.org/extensions",
-            "themeColor": "0076D7" if color == "default" else "FF9800" if color == "warning" else "FF5252",
+            "themeColor": theme_color,
             "summary": insight["title"],
             "sections": [
                 {
@@ -209,33 +250,22 @@ class TeamsService:
                 "targets": [{"os": "default", "uri": f"https://app.tuple.io/insights/{insight['id']}"}],
             }]
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    webhook_url,
-                    json=card,
-                    timeout=10,
-                )
-                response.raise_for_status()
-            
-            self._integrations[integration_id]["last_message_at"] = datetime.utcnow()
-            
-            return {"success": True}
-        except httpx.HTTPError as e:
-            logger.error(f"Teams insight message failed: {e}")
-            raise
+        return card
     
     def _to_response(self, data: Dict[str, Any]) -> IntegrationResponse:
-        """Convert internal data to response model."""
-        return IntegrationResponse(
-            id=data["id"],
-            type=data["type"],
-            name=data["name"],
-            enabled=data["enabled"],
-            status=data["status"],
-            last_message_at=data.get("last_message_at"),
-            created_at=data["created_at"],
-        )
+        """Convert internal data to response model, reusing it until the record changes."""
+        response = data.get("response")
+        if response is None:
+            response = data["response"] = IntegrationResponse(
+                id=data["id"],
+                type=data["type"],
+                name=data["name"],
+                enabled=data["enabled"],
+                status=data["status"],
+                last_message_at=data.get("last_message_at"),
+                created_at=data["created_at"],
+            )
+        return response
 
 
 # Singleton instance
@@ -248,3 +278,19 @@ def get_teams_service() -> TeamsService:
     if _teams_service is None:
         _teams_service = TeamsService()
     return _teams_service
+
+
+def _get_shared_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(timeout=10.0, limits=_CLIENT_LIMITS)
+    return _shared_client
+
+
+async def close_clients() -> None:
+    """Close the shared HTTP client. Call once at application shutdown."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
@@ -0,0 +1,11 @@
+import pytest
+
+from app.models import ConnectionConfig
+
+
+@pytest.fixture
+def csv_config(tmp_path):
+    """Config for a small CSV file in a fresh directory, so cached results never carry over."""
+    path = tmp_path / "sales.csv"
+    path.write_text("region,amount\nEU,10\nUS,25\nEU,40\n")
+    return ConnectionConfig(file_path=str(path))
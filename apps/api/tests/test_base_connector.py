@@ -0,0 +1,35 @@
+import pytest
+
+from app.connectors.base import _add_limit
+
+
+def test_limit_is_added_to_select():
+    assert _add_limit("SELECT * FROM t;", 100) == "SELECT * FROM t LIMIT 100"
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT * FROM t LIMIT 10",
+    "SELECT * FROM t limit\n10",
+    "SELECT * FROM t LIMIT ALL",
+    "SELECT * FROM t LIMIT $1",
+    "SELECT * FROM t LIMIT %s",
+    "SELECT * FROM t LIMIT ?",
+    "SELECT * FROM t LIMIT :n",
+    "SELECT * FROM t LIMIT (SELECT count(*) FROM u)",
+])
+def test_existing_limit_is_kept(query):
+    assert _add_limit(query, 100) == query
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT speed_limit FROM t",
+    "SELECT * FROM t WHERE name = 'limit'",
+    "SELECT limits FROM t",
+])
+def test_limit_in_identifiers_does_not_count(query):
+    assert _add_limit(query, 100) == f"{query} LIMIT 100"
+
+
+def test_non_select_is_unchanged():
+    query = "UPDATE t SET a = 1"
+    assert _add_limit(query, 100) == query
@@ -0,0 +1,43 @@
+from app.core import cache
+from app.core.cache import LRUCache, normalize_query
+
+
+def test_normalize_query_collapses_whitespace():
+    assert normalize_query("  SELECT *\n\tFROM  data ") == "SELECT * FROM data"
+
+
+def test_normalize_query_keeps_quoted_literals():
+    query = "SELECT * FROM data WHERE name = 'a  b' AND \"odd  col\" = 'it''s  x'"
+    assert normalize_query(query) == query
+    assert normalize_query("region = 'EU  '") != normalize_query("region = 'EU'")
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert len(lru) == 2
+
+
+def test_lru_entries_expire_after_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    lru = LRUCache()
+    lru.set("short", 1, ttl=10)
+    lru.set("forever", 2)
+    
+    now += 11
+    assert lru.get("short") is None
+    assert lru.get("forever") == 2
+    assert len(lru) == 1
+
+
+def test_lru_size_zero_disables_cache():
+    lru = LRUCache(maxsize=0)
+    lru.set("a", 1)
+    assert lru.get("a") is None
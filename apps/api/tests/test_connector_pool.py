@@ -0,0 +1,86 @@
+import pytest
+
+from app import connectors
+from app.connectors import close_connectors, release_connector, use_connector
+from app.core.config import settings
+from app.models import DataSourceType
+
+
+CSV = DataSourceType.CSV
+
+
+@pytest.fixture(autouse=True)
+async def empty_pool():
+    yield
+    await close_connectors()
+
+
+async def connected(source_id, config):
+    """Check out a source's connector once, leaving it connected in the pool."""
+    async with use_connector(source_id, CSV, config) as connector:
+        await connector.get_table_count("data")
+    return connector
+
+
+async def test_connector_is_reused_per_source(csv_config):
+    first = await connected("a", csv_config)
+    assert await connected("a", csv_config) is first
+    assert await connected("b", csv_config) is not first
+
+
+async def test_release_leaves_other_sources_with_the_same_config_open(csv_config):
+    first = await connected("a", csv_config)
+    second = await connected("b", csv_config)
+    await release_connector("a")
+    assert first._con is None
+    assert second._con is not None
+
+
+async def test_release_waits_for_queries_in_flight(csv_config):
+    async with use_connector("a", CSV, csv_config) as connector:
+        await connector.get_table_count("data")
+        await release_connector("a")
+        _, rows, _ = await connector.execute_query("SELECT * FROM data")
+        assert len(rows) == 3
+    assert connector._con is None
+    assert await connected("a", csv_config) is not connector
+
+
+async def test_changed_config_swaps_connector(csv_config, tmp_path):
+    first = await connected("a", csv_config)
+    other = tmp_path / "other.csv"
+    other.write_text("x\n1\n")
+    second = await connected("a", csv_config.model_copy(update={"file_path": str(other)}))
+    assert second is not first
+    assert first._con is None
+
+
+async def test_pool_is_bounded(csv_config, monkeypatch):
+    monkeypatch.setattr(connectors, "settings", settings.model_copy(update={"connector_pool_size": 2}))
+    oldest = await connected("a", csv_config)
+    await connected("b", csv_config)
+    await connected("c", csv_config)
+    assert set(connectors._connector_pool) == {"b", "c"}
+    assert oldest._con is None
+
+
+async def test_idle_connectors_are_evicted(csv_config, monkeypatch):
+    idle = await connected("a", csv_config)
+    monkeypatch.setattr(connectors, "settings", settings.model_copy(update={"connector_idle_ttl": -1}))
+    await connectors._evict_stale()
+    assert not connectors._connector_pool
+    assert idle._con is None
+
+
+async def test_dead_connectors_are_evicted(csv_config, monkeypatch):
+    dead = await connected("a", csv_config)
+    alive = await connected("b", csv_config)
+
+    async def fail():
+        raise ConnectionError("server closed the connection")
+
+    monkeypatch.setattr(dead, "ping", fail)
+    await connectors._evict_stale()
+    assert set(connectors._connector_pool) == {"b"}
+    assert dead._con is None
+    assert alive._con is not None
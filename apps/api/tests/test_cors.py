@@ -0,0 +1,56 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.cors import FastCORSMiddleware
+
+
+def make_client(allow_origins):
+    app = FastAPI()
+    app.add_middleware(FastCORSMiddleware, allow_origins=allow_origins)
+    
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+    
+    return TestClient(app)
+
+
+PREFLIGHT_HEADERS = {
+    "origin": "https://app.example.com",
+    "access-control-request-method": "POST",
+    "access-control-request-headers": "content-type",
+}
+
+
+@pytest.mark.parametrize("allow_origins", [["*"], ["https://app.example.com"]])
+def test_allowed_origin_is_echoed(allow_origins):
+    client = make_client(allow_origins)
+    
+    response = client.options("/ping", headers=PREFLIGHT_HEADERS)
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "https://app.example.com"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-allow-headers"] == "content-type"
+    
+    response = client.get("/ping", headers={"origin": "https://app.example.com"})
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "https://app.example.com"
+    assert "Origin" in response.headers["vary"]
+
+
+def test_other_origin_is_refused():
+    client = make_client(["https://app.example.com"])
+    
+    response = client.options("/ping", headers={**PREFLIGHT_HEADERS, "origin": "https://evil.example"})
+    assert response.status_code == 400
+    assert "access-control-allow-origin" not in response.headers
+    
+    response = client.get("/ping", headers={"origin": "https://evil.example"})
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_request_without_origin_is_untouched():
+    response = make_client(["*"]).get("/ping")
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from app.connectors.csv_connector import CSVConnector
+
+
+@pytest.fixture(params=["table", "dataset"])
+async def connector(request, csv_config):
+    """A CSV connector, once with the file loaded into memory and once scanned through Arrow."""
+    connector = CSVConnector(csv_config)
+    if request.param == "dataset":
+        connector.MATERIALIZE_MAX_BYTES = 0
+    yield connector
+    await connector.disconnect()
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT content FROM read_text('{path}')",
+    "SELECT * FROM read_csv('{path}')",
+    "SELECT * FROM read_csv_auto('{path}')",
+    "SELECT * FROM '{path}'",
+])
+async def test_other_files_cannot_be_read(connector, tmp_path, query):
+    other = tmp_path / "secret.csv"
+    other.write_text("key\nhunter2\n")
+    with pytest.raises(Exception, match="disabled"):
+        await connector.execute_query(query.format(path=other))
+
+
+async def test_copy_is_refused(connector, tmp_path):
+    target = tmp_path / "out.csv"
+    with pytest.raises(ValueError):
+        await connector.execute_query(f"COPY (SELECT 42) TO '{target}'")
+    assert not target.exists()
+
+
+async def test_second_statement_in_filter_is_refused(connector, tmp_path):
+    target = tmp_path / "out.csv"
+    with pytest.raises(ValueError):
+        await connector.execute_query(f"1=1; COPY (SELECT 42) TO '{target}'")
+    assert not target.exists()
+
+
+async def test_file_access_cannot_be_reenabled(connector):
+    await connector.connect()
+    with pytest.raises(Exception):
+        await connector.execute_query("SET enable_external_access = true")
+    with pytest.raises(Exception):
+        connector._con.execute("SET enable_external_access = true")
+
+
+async def test_concurrent_queries_share_one_connector(connector):
+    queries = [f"amount > {threshold}" for threshold in range(16)]
+    results = await asyncio.gather(*(connector.execute_query(q) for q in queries))
+    assert [len(rows) for _, rows, _ in results] == [3] * 10 + [2] * 6
+
+
+async def test_concurrent_first_requests_connect_once(connector, monkeypatch):
+    connects = 0
+    original_connect = connector.connect
+    
+    async def counting_connect():
+        nonlocal connects
+        connects += 1
+        return await original_connect()
+    
+    monkeypatch.setattr(connector, "connect", counting_connect)
+    await asyncio.gather(*(connector.get_table_count("data") for _ in range(8)))
+    assert connects == 1
+
+
+async def test_timeout_interrupts_only_its_own_query(connector):
+    slow = connector.execute_query("SELECT count(*) FROM range(100000000000)", timeout=0.2)
+    fast = connector.execute_query("region = 'EU'")
+    slow_result, fast_result = await asyncio.gather(slow, fast, return_exceptions=True)
+    assert isinstance(slow_result, TimeoutError)
+    assert len(fast_result[1]) == 2
+
+
+async def test_changed_file_is_reloaded(connector, csv_config):
+    _, rows, _ = await connector.execute_query("SELECT * FROM data")
+    assert len(rows) == 3
+    
+    with open(csv_config.file_path, "a") as f:
+        f.write("US,5\n")
+    
+    _, rows, _ = await connector.execute_query("SELECT * FROM data")
+    assert len(rows) == 4
+    schema = await connector.get_schema()
+    assert schema.tables[0].row_count == 4
+
+
+async def test_reload_keeps_queries_in_flight_running(connector, csv_config):
+    await connector.get_table_count("data")
+    # A query that has opened its cursor but not yet run all of its statements
+    cursor = connector._cursor()
+    
+    with open(csv_config.file_path, "a") as f:
+        f.write("US,5\n")
+    assert await connector.get_table_count("data") == 4
+    
+    # An Arrow dataset already scans the new file; a loaded table still holds the old rows
+    assert cursor.execute("SELECT count(*) FROM data").fetchone()[0] in (3, 4)
+    cursor.close()
+
+
+async def test_cached_rows_cannot_be_modified_by_callers(connector):
+    _, rows, _ = await connector.execute_query("region = 'EU'")
+    rows[0][0] = "changed"
+    rows.clear()
+    
+    _, rows, _ = await connector.execute_query("region = 'EU'")
+    assert rows == [["EU", 10], ["EU", 40]]
+
+
+async def test_select_all_returns_every_row(connector):
+    columns, rows, _ = await connector.execute_query("select *")
+    assert [column.name for column in columns] == ["region", "amount"]
+    assert rows == [["EU", 10], ["US", 25], ["EU", 40]]
+
+
+async def test_filter_is_applied_as_where_clause(connector):
+    _, rows, _ = await connector.execute_query("amount > 10 and region = 'EU';")
+    assert rows == [["EU", 40]]
+
+
+async def test_limit_bounds_rows(connector):
+    _, rows, _ = await connector.execute_query("SELECT * FROM data ORDER BY amount", limit=2)
+    assert rows == [["EU", 10], ["US", 25]]
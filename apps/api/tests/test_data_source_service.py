@@ -0,0 +1,32 @@
+import pytest
+
+from app import connectors
+from app.connectors import close_connectors
+from app.models import ConnectionConfig, DataSourceCreate, DataSourceType
+from app.services.data_source_service import DataSourceService
+
+
+@pytest.fixture(autouse=True)
+async def empty_pool():
+    yield
+    await close_connectors()
+
+
+async def test_failed_create_releases_connector_and_can_be_retried(tmp_path):
+    path = tmp_path / "late.csv"
+    data = DataSourceCreate(
+        name="Late file",
+        type=DataSourceType.CSV,
+        config=ConnectionConfig(file_path=str(path)),
+    )
+    service = DataSourceService()
+    
+    with pytest.raises(ValueError, match="Connection failed"):
+        await service.create_data_source(data)
+    assert not connectors._connector_pool
+    assert not await service.list_data_sources()
+    
+    path.write_text("region,amount\nEU,10\n")
+    source = await service.create_data_source(data)
+    assert source.schema_data.tables[0].row_count == 1
+    assert list(connectors._connector_pool) == [source.id]
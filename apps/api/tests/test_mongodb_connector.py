@@ -0,0 +1,64 @@
+import pytest
+from bson import ObjectId
+
+from app.connectors.mongodb import MongoDBConnector
+from app.models import ConnectionConfig
+
+
+@pytest.fixture
+def connector():
+    return MongoDBConnector(ConnectionConfig(host="localhost", database="test"))
+
+
+def test_pipeline_gets_projection_and_limit(connector):
+    pipeline = connector._build_pipeline([{"$match": {"a": 1}}], {"a": 1}, 100)
+    assert pipeline == [{"$match": {"a": 1}}, {"$project": {"a": 1}}, {"$limit": 100}]
+
+
+def test_existing_projection_is_kept(connector):
+    stages = [{"$project": {"b": 1}}]
+    assert connector._build_pipeline(stages, {"a": 1}, 100) == stages + [{"$limit": 100}]
+
+
+@pytest.mark.parametrize("stage", [{"$out": "copy"}, {"$merge": {"into": "copy"}}])
+def test_nothing_is_appended_after_output_stage(connector, stage):
+    stages = [{"$match": {}}, stage]
+    assert connector._build_pipeline(stages, {"a": 1}, 100) == stages
+
+
+def test_smaller_trailing_limit_is_kept(connector):
+    stages = [{"$sort": {"a": -1}}, {"$limit": 5}]
+    assert connector._build_pipeline(stages, None, 100) == stages
+
+
+def test_larger_trailing_limit_is_bounded(connector):
+    stages = [{"$limit": 500}]
+    assert connector._build_pipeline(stages, None, 100) == stages + [{"$limit": 100}]
+
+
+def test_user_pipeline_is_not_modified(connector):
+    stages = [{"$match": {}}]
+    connector._build_pipeline(stages, {"a": 1}, 100)
+    assert stages == [{"$match": {}}]
+
+
+def test_object_ids_are_converted_in_every_document(connector):
+    first, later = ObjectId(), ObjectId()
+    docs = [
+        {"_id": first, "ref": None, "name": "a"},
+        {"_id": later, "ref": first, "name": "b"},
+        {"_id": later, "name": "c"},
+    ]
+    columns, rows = connector._docs_to_rows(docs)
+    assert [column.name for column in columns] == ["_id", "ref", "name"]
+    assert rows == [
+        [str(first), None, "a"],
+        [str(later), str(first), "b"],
+        [str(later), None, "c"],
+    ]
+
+
+def test_single_column_object_ids_are_converted(connector):
+    oid = ObjectId()
+    _, rows = connector._docs_to_rows([{"ref": None}, {"ref": oid}])
+    assert rows == [[None], [str(oid)]]
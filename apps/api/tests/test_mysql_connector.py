@@ -0,0 +1,78 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.connectors.mysql import MySQLConnector
+from app.models import ConnectionConfig
+
+
+class FakeCursor:
+    def __init__(self, rows, delay=0.0):
+        self._rows = list(rows)
+        self._delay = delay
+        self.description = [("id",)]
+        self.closed = False
+    
+    async def execute(self, query):
+        self.query = query
+        await asyncio.sleep(self._delay)
+    
+    async def fetchmany(self, size):
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        return batch
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.closed = False
+    
+    async def cursor(self, cursor_class):
+        return self._cursor
+    
+    def close(self):
+        self.closed = True
+
+
+class FakePool:
+    def __init__(self, conn):
+        self._conn = conn
+    
+    @asynccontextmanager
+    async def acquire(self):
+        yield self._conn
+
+
+def make_connector(cursor):
+    connector = MySQLConnector(ConnectionConfig(host="localhost", database="test"))
+    conn = FakeConnection(cursor)
+    connector._pool = FakePool(conn)
+    return connector, conn
+
+
+async def test_fully_read_result_keeps_connection():
+    cursor = FakeCursor([(1,), (2,)])
+    connector, conn = make_connector(cursor)
+    _, rows, _ = await connector.execute_query("SELECT id FROM t", limit=2)
+    assert rows == [[1], [2]]
+    assert cursor.closed and not conn.closed
+
+
+async def test_unread_rows_drop_connection_instead_of_draining():
+    cursor = FakeCursor([(i,) for i in range(10)])
+    connector, conn = make_connector(cursor)
+    _, rows, _ = await connector.execute_query("SELECT id FROM t LIMIT 1000", limit=3)
+    assert rows == [[0], [1], [2]]
+    assert conn.closed and not cursor.closed
+
+
+async def test_timeout_drops_connection():
+    cursor = FakeCursor([(1,)], delay=1)
+    connector, conn = make_connector(cursor)
+    with pytest.raises(TimeoutError):
+        await connector.execute_query("SELECT id FROM t", timeout=0.05)
+    assert conn.closed and not cursor.closed
@@ -0,0 +1,42 @@
+import logging
+
+import httpx
+import orjson
+
+from app.connectors import rest_api
+from app.connectors.rest_api import RESTAPIConnector
+from app.models import ConnectionConfig
+
+
+def make_connector(total_pages, failing_pages=()):
+    def handler(request):
+        page = int(request.url.params.get("page", 1))
+        if page in failing_pages:
+            return httpx.Response(503)
+        body = {"page": page, "total_pages": total_pages, "data": [{"page": page}]}
+        return httpx.Response(200, content=orjson.dumps(body))
+    
+    connector = RESTAPIConnector(ConnectionConfig(api_url="https://api.example.com/items"))
+    connector._client = httpx.AsyncClient(
+        base_url="https://api.example.com/items", transport=httpx.MockTransport(handler)
+    )
+    return connector
+
+
+async def test_failed_pages_are_skipped_and_logged(caplog):
+    connector = make_connector(total_pages=4, failing_pages={3})
+    with caplog.at_level(logging.WARNING):
+        records = await connector._fetch_remaining_pages({"page": 1, "total_pages": 4})
+    assert records == [{"page": 2}, {"page": 4}]
+    assert "page 3" in caplog.text
+    await connector._client.aclose()
+
+
+async def test_page_cap_is_logged(caplog, monkeypatch):
+    monkeypatch.setattr(rest_api, "_MAX_PAGES", 3)
+    connector = make_connector(total_pages=10)
+    with caplog.at_level(logging.WARNING):
+        records = await connector._fetch_remaining_pages({"page": 1, "total_pages": 10})
+    assert records == [{"page": 2}, {"page": 3}]
+    assert "10 pages" in caplog.text
+    await connector._client.aclose()